@@ -0,0 +1,71 @@
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# ASS serialization core
+# -----------------------------------------------------------------------------
+# Shared by the renderer, the effects and the legacy build_ass path. Timestamps
+# are formatted with integer math only (no float rounding drift) and memoized,
+# since particle presets format the same few thousand timestamps many times.
+
+EVENTS_FORMAT = "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text"
+
+
+@lru_cache(maxsize=1 << 16)
+def _format_cs(cs: int) -> str:
+    return f"{cs // 360000}:{cs // 6000 % 60:02d}:{cs // 100 % 60:02d}.{cs % 100:02d}"
+
+
+def ms_to_ass(ms) -> str:
+    """Converts milliseconds to ASS timestamp format H:MM:SS.cc"""
+    return _format_cs(int(ms) // 10)
+
+
+@lru_cache(maxsize=1 << 16)
+def ass_to_cs(ts: str) -> int:
+    """Parses an H:MM:SS.cc timestamp (as written above) into centiseconds."""
+    return int(ts[:-9]) * 360000 + int(ts[-8:-6]) * 6000 + int(ts[-5:-3]) * 100 + int(ts[-2:])
+
+
+# "MM:SS." and "cc" strings indexed by value, so array timestamps format as lookups.
+_MMSS = np.array([f"{m:02d}:{s:02d}." for m in range(60) for s in range(60)], dtype=object)
+_CC = np.array([f"{c:02d}" for c in range(100)], dtype=object)
+
+
+def ass_times(ms) -> np.ndarray:
+    """Vectorized ms_to_ass for an array of milliseconds."""
+    cs = np.asarray(ms, dtype=np.int64) // 10
+    hours = (cs // 360000).astype(str).astype(object)
+    return hours + ":" + _MMSS[(cs // 100) % 3600] + _CC[cs % 100]
+
+
+def build_script(header: str, event_groups: Iterable[Iterable[str]]) -> str:
+    """
+    Joins the header (ending with the [Events] Format line) and the Dialogue
+    lines of every group in a single str.join.
+    """
+    return header + "\n".join(chain.from_iterable(event_groups))
+
+
+def iter_script(header: str, event_groups: Iterable[Iterable[str]]) -> Iterator[str]:
+    """
+    Yields the same text as build_script() in chunks (the header, then one
+    chunk per group), so a script can be streamed without holding it all.
+    """
+    yield header
+    separator = ""
+    for lines in event_groups:
+        if lines:
+            yield separator + "\n".join(lines)
+            separator = "\n"
+
+
+def write_script(path: Path, header: str, event_groups: Iterable[Iterable[str]]):
+    """Streams a script straight to path."""
+    with open(path, "w", encoding="utf-8") as fp:
+        for chunk in iter_script(header, event_groups):
+            fp.write(chunk)
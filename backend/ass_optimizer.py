@@ -0,0 +1,237 @@
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# -----------------------------------------------------------------------------
+# ASS optimizer: generated styles and compact drawings
+# -----------------------------------------------------------------------------
+# Presets repeat the same static override tags (\1c, \3c, \bord, \alpha, \an,
+# ...) at the start of thousands of events. StyleHoister moves the ones that a
+# [V4+ Styles] field can express into generated styles ("Default_1", ...) and
+# points the event at that style instead, which makes the script smaller and
+# means libass sets them once per style instead of parsing them per event.
+# Only tags in the first override block, before any \t, are moved,
+# and never from events that use \r (it resets to the event's style), so
+# rendering is unchanged. \blur, \pos, \move, \fad and transforms have no style
+# field and stay inline.
+#
+# Vector drawings are rewritten in a canonical compact form (repeated l/b
+# commands folded, whitespace normalised, memoized per distinct drawing), so
+# every copy of a shape is the same string and libass's outline cache, which
+# is keyed on the drawing text, builds each shape once.
+
+# Exports write optimized scripts unless ASS_OPTIMIZE=0
+ASS_OPTIMIZE = os.getenv("ASS_OPTIMIZE", "1") == "1"
+MAX_GENERATED_STYLES = 256
+# Distinct tag sets remembered per script
+MAX_PLANS = 65536
+
+# Style field touched by each hoistable tag
+_COLOR_FIELDS = {"c": "PrimaryColour", "1c": "PrimaryColour", "2c": "SecondaryColour", "3c": "OutlineColour", "4c": "BackColour"}
+_ALPHA_FIELDS = {
+    "alpha": ("PrimaryColour", "SecondaryColour", "OutlineColour", "BackColour"),
+    "1a": ("PrimaryColour",),
+    "2a": ("SecondaryColour",),
+    "3a": ("OutlineColour",),
+    "4a": ("BackColour",),
+}
+_NUMBER_FIELDS = {"bord": "Outline", "shad": "Shadow", "fs": "Fontsize", "fsp": "Spacing"}
+
+_TAG_RE = re.compile(r"(?P<name>alpha|[1-4]a|[1-4]?c|bord|shad|fsp|fs|an|b)(?P<value>[&\d.+\-].*)\Z|fn(?P<font>.+)\Z", re.S)
+# The same tags inside an override block (up to the next tag)
+_STYLE_TAG_RE = re.compile(r"\\(?=[abcf1-4])((?:alpha|[1-4]a|[1-4]?c|bord|shad|fsp|fs|an|b)[&\d.+\-][^\\]*|fn[^\\]+)")
+# Tags that interact with hoistable ones in order (\t animates from the current
+# value, \xbord after \bord, legacy \a alignment); only tags before the first move.
+_BARRIER_RE = re.compile(r"\\(?:t\(|r|[xy](?:bord|shad)|a\d)")
+_HEX_RE = re.compile(r"&H([0-9A-Fa-f]{1,8})&?\Z")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?\Z")
+_ALIGN_RE = re.compile(r"\\(?:an|a)\d")
+_DRAWING_RE = re.compile(r"(\\p[1-9][^}]*\})([^{]+)")
+
+
+def _parse_color(value: str) -> Optional[Tuple[int, int]]:
+    """&HAABBGGRR -> (alpha, bgr)."""
+    match = _HEX_RE.match(value)
+    if match is None:
+        return None
+    number = int(match.group(1), 16)
+    return number >> 24, number & 0xFFFFFF
+
+
+@lru_cache(maxsize=4096)
+def canonical_drawing(drawing: str) -> str:
+    """Compact, canonical text for a \\p drawing: single spaces, integers without
+    a fractional part, and repeated l/b commands folded into one."""
+    out = []
+    command = None
+    for token in drawing.split():
+        if token.isalpha():
+            if token == command and token in ("l", "b"):
+                continue
+            command = token
+            out.append(token)
+            continue
+        try:
+            number = float(token)
+        except ValueError:
+            return drawing
+        out.append(str(int(number)) if number.is_integer() else token)
+    return " ".join(out)
+
+
+class StyleHoister:
+    """
+    Rewrites Dialogue lines of one script, collecting the generated styles.
+    Feed every event through optimize(), then write header() (which includes
+    the generated styles) before the events.
+    """
+
+    def __init__(self, header: str, max_styles: int = MAX_GENERATED_STYLES):
+        self._header = header
+        self.max_styles = max_styles
+        self.fields: List[str] = []
+        self.styles: Dict[str, List[str]] = {}
+        for line in header.splitlines():
+            if line.startswith("Format:") and "Fontname" in line:
+                self.fields = [f.strip() for f in line[len("Format:"):].split(",")]
+            elif line.startswith("Style:") and self.fields:
+                values = [v.strip() for v in line[len("Style:"):].split(",", len(self.fields) - 1)]
+                self.styles[values[0]] = values
+        self.generated: Dict[Tuple, str] = {}
+        self._generated_lines: List[str] = []
+        self._plans: Dict[Tuple, Optional[Tuple[str, int]]] = {}
+        self.hoisted_tags = 0
+
+    def header(self) -> str:
+        """The original header with the generated styles added after the last style."""
+        if not self._generated_lines:
+            return self._header
+        lines = self._header.split("\n")
+        last_style = max(i for i, line in enumerate(lines) if line.startswith("Style:"))
+        return "\n".join(lines[:last_style + 1] + self._generated_lines + lines[last_style + 1:])
+
+    def optimize(self, lines: Iterable[str]) -> List[str]:
+        return [self.optimize_line(line) for line in lines]
+
+    def optimize_line(self, line: str) -> str:
+        if not line.startswith("Dialogue:"):
+            return line
+        parts = line.split(",", 9)
+        if len(parts) < 10:
+            return line
+        text = parts[9]
+        if "\\p" in text:
+            text = _DRAWING_RE.sub(lambda m: m.group(1) + canonical_drawing(m.group(2)), text)
+        if text.startswith("{") and "\\r" not in text and parts[3] in self.styles:
+            end = text.find("}")
+            if end > 0:
+                hoisted = self._hoist(parts[3], text[1:end], text[end + 1:])
+                if hoisted is not None:
+                    parts[3], text = hoisted
+        parts[9] = text
+        return ",".join(parts)
+
+    def _hoist(self, style_name: str, block: str, rest: str) -> Optional[Tuple[str, str]]:
+        barrier = _BARRIER_RE.search(block)
+        limit = barrier.start() if barrier else len(block)
+        found = list(_STYLE_TAG_RE.finditer(block, 0, limit))
+        if not found:
+            return None
+        style_tags = tuple(match.group(1) for match in found)
+        later_alignment = False
+        if any(tag.startswith("an") for tag in style_tags):
+            later_alignment = bool(_ALIGN_RE.search(block, limit)) or bool(_ALIGN_RE.search(rest))
+        plan = self._plan(style_name, style_tags, later_alignment)
+        if plan is None:
+            return None
+        # Tags after the first one that cannot move stay inline, in order.
+        generated, hoisted = plan
+        pieces = []
+        pos = 0
+        for match in found[:hoisted]:
+            pieces.append(block[pos:match.start()])
+            pos = match.end()
+        pieces.append(block[pos:])
+        block = "".join(pieces)
+        self.hoisted_tags += hoisted
+        return generated, (f"{{{block}}}" if block else "") + rest
+
+    def _plan(self, style_name: str, style_tags: Tuple[str, ...], later_alignment: bool) -> Optional[Tuple[str, int]]:
+        """(style to use, how many of style_tags it absorbs), memoized: events mostly repeat a few tag sets."""
+        key = (style_name, style_tags, later_alignment)
+        if key in self._plans:
+            return self._plans[key]
+        values = dict(zip(self.fields, self.styles[style_name]))
+        updates: Dict[str, str] = {}
+        hoisted = 0
+        for n, tag in enumerate(style_tags):
+            rest_alignment = later_alignment or any(t.startswith("an") for t in style_tags[n + 1:])
+            update = self._style_update(_TAG_RE.match(tag), values, updates, rest_alignment)
+            if update is None:
+                break
+            updates.update(update)
+            hoisted += 1
+        plan = None
+        if hoisted:
+            if all(values[field] == value for field, value in updates.items()):
+                plan = (style_name, hoisted)  # the tags only restate the style
+            else:
+                style_key = (style_name, tuple(sorted(updates.items())))
+                generated = self.generated.get(style_key)
+                if generated is None and len(self.generated) < self.max_styles:
+                    generated = f"{style_name}_{len(self.generated) + 1}"
+                    self.generated[style_key] = generated
+                    style = dict(values, **updates)
+                    style["Name"] = generated
+                    self._generated_lines.append("Style: " + ",".join(style[field] for field in self.fields))
+                if generated is not None:
+                    plan = (generated, hoisted)
+        if len(self._plans) < MAX_PLANS:
+            self._plans[key] = plan
+        return plan
+
+    def _style_update(self, match, values: Dict[str, str], updates: Dict[str, str], later_alignment: bool) -> Optional[Dict[str, str]]:
+        """Style fields set by one tag (given the fields set so far), or None if it must stay inline."""
+        if match.group("font") is not None:
+            font = match.group("font")
+            return None if "," in font else {"Fontname": font}
+        name, value = match.group("name"), match.group("value")
+        if name in _COLOR_FIELDS:
+            field = _COLOR_FIELDS[name]
+            color = _parse_color(value)
+            current = _parse_color(updates.get(field, values[field]))
+            if color is None or current is None:
+                return None
+            return {field: "&H%02X%06X" % (current[0], color[1])}
+        if name in _ALPHA_FIELDS:
+            alpha = _parse_color(value)
+            currents = [(field, _parse_color(updates.get(field, values[field]))) for field in _ALPHA_FIELDS[name]]
+            if alpha is None or any(current is None for _, current in currents):
+                return None
+            return {field: "&H%02X%06X" % (alpha[1] & 0xFF, current[1]) for field, current in currents}
+        if name in _NUMBER_FIELDS:
+            if not _NUMBER_RE.match(value) or (name == "fs" and float(value) <= 0):
+                return None
+            return {_NUMBER_FIELDS[name]: value}
+        if name == "an":
+            # First \an wins; it can only move if no other alignment tag follows it.
+            if not value.isdigit() or not 1 <= int(value) <= 9:
+                return None
+            if later_alignment:
+                return None
+            return {"Alignment": value}
+        if name == "b":
+            return {"Bold": value} if value in ("0", "1") else None
+        return None
+
+
+def optimize_script(script: str) -> str:
+    """Optimizes a whole script held in memory (see StyleHoister)."""
+    head, marker, events = script.partition("\n[Events]\n")
+    if not marker:
+        return script
+    format_line, _, body = events.partition("\n")
+    hoister = StyleHoister(head + marker + format_line + "\n")
+    optimized = "\n".join(hoister.optimize(body.split("\n")))
+    return hoister.header() + optimized
@@ -0,0 +1,94 @@
+import os
+import shutil
+import subprocess
+import threading
+import uuid
+from pathlib import Path
+import numpy as np
+from faster_whisper import decode_audio
+
+# -----------------------------------------------------------------------------
+# Audio-only extraction for Whisper
+# -----------------------------------------------------------------------------
+# Uploads are usually 1080p/4K video. Handing the container to model.transcribe
+# makes PyAV demux every video packet; instead ffmpeg decodes only the first
+# audio stream straight to 16 kHz mono s16le on a pipe, read into NumPy with no
+# temp WAV. The PCM is cached per media hash as int16 .npy (half the size of
+# float32; converted on load), so every stage that needs audio decodes the
+# upload at most once. The cache counts toward the storage quota (export_cache).
+SAMPLE_RATE = 16000
+
+# Striped locks: extraction of one hash is serialised without a lock per hash.
+_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def _lock_for(media_hash: str) -> threading.Lock:
+    return _LOCKS[hash(media_hash) % len(_LOCKS)]
+
+
+def _to_float(samples: np.ndarray) -> np.ndarray:
+    """float32 copy of samples in [-1, 1) (never a view, so a memory map can be dropped)."""
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / 32768.0
+    return np.array(samples, dtype=np.float32)  # float32 caches from older versions
+
+
+def extract_pcm_s16(media_path: Path) -> np.ndarray:
+    """Decodes the first audio stream of media_path to 16 kHz mono int16."""
+    if not shutil.which("ffmpeg"):
+        # PyAV fallback: still only decodes the audio stream.
+        audio = decode_audio(str(media_path), sampling_rate=SAMPLE_RATE)
+        return (np.clip(audio, -1.0, 32767 / 32768) * 32768.0).astype(np.int16)
+    cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-threads",
+        "0",
+        "-i",
+        str(media_path),
+        "-map",
+        "0:a:0",
+        "-vn",
+        "-sn",
+        "-dn",
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-f",
+        "s16le",
+        "-acodec",
+        "pcm_s16le",
+        "-loglevel",
+        "error",
+        "pipe:1",
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Audio extraction failed: {result.stderr.decode(errors='replace')}")
+    return np.frombuffer(result.stdout, dtype=np.int16)
+
+
+def extract_pcm(media_path: Path) -> np.ndarray:
+    """Decodes the first audio stream of media_path to 16 kHz mono float32."""
+    return _to_float(extract_pcm_s16(media_path))
+
+
+def load_pcm(media_path: Path, media_hash: str, cache_dir: Path) -> np.ndarray:
+    """
+    Returns 16 kHz mono float32 audio for media_path, extracting it on first
+    use and reading it back from cache_dir/<media_hash>.npy afterwards.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cached_path = cache_dir / f"{media_hash}.npy"
+    with _lock_for(media_hash):
+        if cached_path.exists():
+            os.utime(cached_path)  # recently used, for the storage quota
+            # Memory-mapped: the int16 file is converted straight from the page
+            # cache, without a second copy of it on the heap.
+            return _to_float(np.load(cached_path, mmap_mode="r"))
+        samples = extract_pcm_s16(media_path)
+        part_path = cache_dir / f".{uuid.uuid4().hex}.npy"
+        np.save(part_path, samples)
+        os.replace(part_path, cached_path)
+        return _to_float(samples)
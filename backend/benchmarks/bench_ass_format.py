@@ -0,0 +1,89 @@
+"""
+Micro-benchmark for the ASS serialization core on a 10k-word script.
+
+    cd backend && python benchmarks/bench_ass_format.py [--words 10000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from ass_format import _format_cs, ass_times, build_script, ms_to_ass  # noqa: E402
+from render_engine import AdvancedRenderer  # noqa: E402
+
+
+def legacy_ms_to_ass(ms: int) -> str:
+    """The float-based formatter previously copied into main.py and render_engine.py."""
+    s = ms / 1000.0
+    h = int(s // 3600)
+    m = int((s % 3600) // 60)
+    sec = int(s % 60)
+    cs = int((s - int(s)) * 100)
+    return f"{h}:{m:02d}:{sec:02d}.{cs:02d}"
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    words = [
+        {"text": f"word{i}", "start": round(i * 0.37, 3), "end": round(i * 0.37 + 0.33, 3)}
+        for i in range(args.words)
+    ]
+    # Particle presets emit ~12-80 events per word with jittered times around the word.
+    rng = np.random.default_rng(0)
+    word_ms = np.array([int(w["start"] * 1000) for w in words])
+    particle_ms = (word_ms[:, None] + rng.integers(0, 1500, (len(words), 40))).ravel().tolist()
+
+    def legacy_events():
+        lines = []
+        for ms in particle_ms:
+            lines.append(f"Dialogue: 0,{legacy_ms_to_ass(ms)},{legacy_ms_to_ass(ms + 500)},Default,,0,0,0,,x")
+        return "[Events]\n" + "\n".join(lines)
+
+    def cached_events():
+        lines = [f"Dialogue: 0,{ms_to_ass(ms)},{ms_to_ass(ms + 500)},Default,,0,0,0,,x" for ms in particle_ms]
+        return build_script("[Events]\n", [lines])
+
+    def vectorized_events():
+        starts = np.asarray(particle_ms)
+        lines = [
+            f"Dialogue: 0,{a},{b},Default,,0,0,0,,x"
+            for a, b in zip(ass_times(starts).tolist(), ass_times(starts + 500).tolist())
+        ]
+        return build_script("[Events]\n", [lines])
+
+    _format_cs.cache_clear()
+    print(f"{len(particle_ms)} events ({args.words} words x 40), best of {args.repeat}:")
+    baseline = best_of(legacy_events, args.repeat)
+    rows = [
+        ("legacy float ms_to_ass", baseline),
+        ("ms_to_ass (integer + LRU)", best_of(cached_events, args.repeat)),
+        ("ass_times (vectorized)", best_of(vectorized_events, args.repeat)),
+    ]
+    for name, seconds in rows:
+        print(f"  {name:28s} {seconds * 1000:8.1f} ms  {baseline / seconds:5.1f}x")
+
+    print(f"Full renders of {args.words} words:")
+    for preset in ("word-pop", "karaoke-pro", "fire-storm", "cosmic-stars"):
+        seconds = best_of(lambda: AdvancedRenderer(words, {"id": preset}).render(), 1)
+        print(f"  {preset:28s} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import importlib
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+
+from effects.base import Effect
+
+# -----------------------------------------------------------------------------
+# Effect registry
+# -----------------------------------------------------------------------------
+# Every preset lives in effects/<id>.py as an Effect subclass and is imported
+# the first time it is rendered. The metadata below is declared here so the
+# effect list can be served without importing any effect module.
+
+
+class EffectSpec(NamedTuple):
+    class_name: str
+    # "light" (a few events per word), "medium" or "heavy" (dozens of events per word)
+    cost: str
+    # Decorative particle events per word. Their Dialogue lines carry "lod<N>" in
+    # the Name field so the renderer's event budget can thin them (see event_budget).
+    particles: int
+    # Style keys the effect reads beyond the common header ones (all optional)
+    style_keys: Tuple[str, ...] = ()
+
+
+EFFECTS: Dict[str, EffectSpec] = {
+    "fire_storm": EffectSpec("FireStorm", "medium", 12, ()),
+    "cyber_glitch": EffectSpec("CyberGlitch", "light", 0, ()),
+    "neon_pulse": EffectSpec("NeonPulse", "light", 0, ()),
+    "kinetic_bounce": EffectSpec("KineticBounce", "light", 0, ()),
+    "cinematic_blur": EffectSpec("CinematicBlur", "light", 0, ()),
+    "thunder_strike": EffectSpec("ThunderStrike", "light", 0, ()),
+    "typewriter_pro": EffectSpec("TypewriterPro", "light", 0, ()),
+    "rainbow_wave": EffectSpec("RainbowWave", "light", 0, ()),
+    "earthquake_shake": EffectSpec("EarthquakeShake", "light", 0, ()),
+    "word_pop": EffectSpec("WordPop", "light", 0, ()),
+    "retro_arcade": EffectSpec("RetroArcade", "light", 0, ()),
+    "horror_creepy": EffectSpec("HorrorCreepy", "light", 0, ()),
+    "luxury_gold": EffectSpec("LuxuryGold", "light", 0, ()),
+    "comic_book": EffectSpec("ComicBook", "light", 0, ()),
+    "news_ticker": EffectSpec("NewsTicker", "light", 0, ()),
+    "pulse": EffectSpec("Pulse", "light", 3, ()),
+    "bubble_floral": EffectSpec("BubbleFloral", "medium", 8, ()),
+    "falling_heart": EffectSpec("FallingHeart", "medium", 15, ()),
+    "colorful": EffectSpec("Colorful", "medium", 10, ()),
+    "ghost_star": EffectSpec("GhostStar", "medium", 12, ()),
+    "tiktok_group": EffectSpec("TiktokGroup", "light", 0, ()),
+    "matrix_rain": EffectSpec("MatrixRain", "medium", 15, ()),
+    "electric_shock": EffectSpec("ElectricShock", "medium", 6, ()),
+    "smoke_trail": EffectSpec("SmokeTrail", "medium", 10, ()),
+    "pixel_glitch": EffectSpec("PixelGlitch", "light", 0, ()),
+    "neon_sign": EffectSpec("NeonSign", "light", 0, ()),
+    "karaoke_classic": EffectSpec("KaraokeClassic", "light", 0, ()),
+    "fade_in_out": EffectSpec("FadeInOut", "light", 0, ()),
+    "slide_up": EffectSpec("SlideUp", "light", 0, ()),
+    "karaoke_pro": EffectSpec("KaraokePro", "light", 0, ('primary_color', 'outline_color', 'color_past', 'color_future', 'outline_past', 'outline_future')),
+    "zoom_burst": EffectSpec("ZoomBurst", "light", 0, ()),
+    "bounce_in": EffectSpec("BounceIn", "light", 0, ()),
+    "tiktok_yellow_box": EffectSpec("TiktokYellowBox", "light", 0, ()),
+    "tiktok_box_group": EffectSpec("TiktokBoxGroup", "light", 0, ('primary_color', 'secondary_color', 'active_bg_color', 'active_scale')),
+    "dynamic_highlight": EffectSpec("DynamicHighlight", "light", 0, ('primary_color', 'secondary_color')),
+    "ice_crystal": EffectSpec("IceCrystal", "heavy", 75, ()),
+    "thunder_storm": EffectSpec("ThunderStorm", "heavy", 74, ()),
+    "ocean_wave": EffectSpec("OceanWave", "heavy", 78, ()),
+    "cosmic_stars": EffectSpec("CosmicStars", "heavy", 79, ()),
+    "butterfly_dance": EffectSpec("ButterflyDance", "heavy", 78, ()),
+}
+
+# Preset ids that render with another effect.
+ALIASES = {
+    "neon_glow": "neon_pulse",
+    "welcome_my_life": "word_pop",
+}
+DEFAULT_EFFECT = "word_pop"
+
+_loaded: Dict[str, Effect] = {}
+_load_lock = threading.Lock()
+
+
+def resolve_effect_id(style_id: str) -> str:
+    effect_id = (style_id or DEFAULT_EFFECT).replace("-", "_")
+    effect_id = ALIASES.get(effect_id, effect_id)
+    return effect_id if effect_id in EFFECTS else DEFAULT_EFFECT
+
+
+def get_effect(style_id: str) -> Effect:
+    """Returns the effect for a preset id, importing its module on first use."""
+    effect_id = resolve_effect_id(style_id)
+    effect = _loaded.get(effect_id)
+    if effect is None:
+        with _load_lock:
+            effect = _loaded.get(effect_id)
+            if effect is None:
+                module = importlib.import_module(f"effects.{effect_id}")
+                effect = getattr(module, EFFECTS[effect_id].class_name)()
+                _loaded[effect_id] = effect
+    return effect
+
+
+def list_effects() -> List[dict]:
+    return [
+        {
+            "id": effect_id,
+            "cost": spec.cost,
+            "particles": spec.particles,
+            "style_keys": list(spec.style_keys),
+            "loaded": effect_id in _loaded,
+        }
+        for effect_id, spec in EFFECTS.items()
+    ]
@@ -0,0 +1,9 @@
+class Effect:
+    """
+    One subtitle preset. render(r) returns the full ASS for the AdvancedRenderer
+    r, built through one of its block loops (base_loop, indexed_loop,
+    batched_loop) so the block cache and per-block seeding apply.
+    """
+
+    def render(self, r) -> str:
+        raise NotImplementedError
@@ -0,0 +1,26 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Bubble Floral ---
+class BubbleFloral(Effect):
+    def render(self, r) -> str:
+        bubble_shape = "m 0 -15 b -21 -15 -21 16 0 16 b 23 16 23 -15 0 -15"
+        
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            # Main text with rotation
+            rotation = r.rng.choice([-15, 15])
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\move({cx},{cy+20},{cx},{cy})\\frz{rotation}\\t(\\frz0)\\fad(100,100)}}{word['text']}")
+            
+            # Bubbles rising up
+            for _ in range(8):
+                bx = cx + r.rng.randint(-50, 50)
+                by = cy + r.rng.randint(-100, 50)
+                ey = by - r.rng.randint(100, 200)
+                b_start = start + r.rng.randint(0, dur // 2)
+                b_end = b_start + r.rng.randint(800, 1200)
+                size = r.rng.randint(10, 30)
+                res.append(f"Dialogue: 0,{ms_to_ass(b_start)},{ms_to_ass(b_end)},Default,lod1,0,0,0,,{{\\an5\\move({bx},{by},{bx},{ey})\\fscx{size}\\fscy{size}\\1c&HFFFFFF&\\3c&HFFFFFF&\\blur5\\fad(100,200)\\p1}}{bubble_shape}{{\\p0}}")
+            return res
+        return r.base_loop(effect)
@@ -0,0 +1,82 @@
+import numpy as np
+
+from ass_format import ass_times
+from effects.base import Effect
+from particles import format_events
+
+
+# --- BUTTERFLY DANCE 🦋 ---
+class ButterflyDance(Effect):
+    def render(self, r) -> str:
+        butterfly = "m 10 15 b 5 10 0 5 0 0 b 0 5 5 10 10 15 m 10 15 b 15 10 20 5 20 0 b 20 5 15 10 10 15"
+        
+        def build(cols, particles, cx, cy):
+            n = len(cols["text"])
+            start, end, dur, text = cols["start"], cols["end"], cols["dur"], cols["text"]
+            t_start, t_end = ass_times(start), ass_times(end)
+            
+            # Layer 1: Flower Glow
+            offset = np.array([[-3, 0, 3]])
+            glow = format_events(
+                "Dialogue: 0,{start},{end},Default,,0,0,0,,{{\\an5\\pos({x},{y})\\1c{color}\\blur18\\alpha&H70&}}{text}",
+                n, start=t_start, end=t_end, x=cx + offset, y=cy + offset,
+                color=np.array([["&HFF69B4&", "&HFF1493&", "&HFF00FF&"]]), text=text,
+            )
+            
+            # Layer 2: Spring Text
+            spring = format_events(
+                "Dialogue: 1,{start},{end},Default,,0,0,0,,{{\\an5\\pos({x},{y})\\1c{color}\\bord2\\3c&H00FF00&\\blur1\\fscx110\\fscy110}}{text}",
+                n, start=t_start, end=t_end, x=cx + np.array([[0, 2, 4]]), y=cy + np.array([[0, 1, 2]]),
+                color=np.array([["&HFF1493&", "&HFF69B4&", "&HFFC0CB&"]]), text=text,
+            )
+            
+            # Layer 3: Flying Butterflies (figure-8 flight path)
+            p = particles.batch(18)
+            t_path = np.arange(18)[None, :] / 18
+            angle1 = np.radians(t_path * 360 * 2)
+            angle2 = np.radians((t_path + 0.5) * 360 * 2)
+            radius = 100
+            b_start = start + p.randint(0, dur // 2)
+            b_end = b_start + p.randint(1200, 1800)
+            wing_flap = "\\t(0,150,\\fscx110\\fscy90)\\t(150,300,\\fscx100\\fscy100)\\t(300,450,\\fscx110\\fscy90)\\t(450,600,\\fscx100\\fscy100)"
+            butterflies = format_events(
+                "Dialogue: 0,{start},{end},Default,lod3,0,0,0,,{{\\an5\\move({x0},{y0},{x1},{y1})\\fscx{size}\\fscy{size}\\1c{color}\\blur4{flap}\\frz{frz}\\p1}}{shape}{{\\p0}}",
+                n, start=ass_times(b_start), end=ass_times(b_end),
+                x0=cx + np.trunc(np.cos(angle1) * radius), y0=cy + np.trunc(np.sin(angle1 * 2) * 50),
+                x1=cx + np.trunc(np.cos(angle2) * radius), y1=cy + np.trunc(np.sin(angle2 * 2) * 50),
+                size=p.randint(30, 50), color=p.choice(["&HFF69B4&", "&HFF00FF&", "&H00FFFF&", "&HFFFF00&"]),
+                flap=wing_flap, frz=p.randint(0, 360), shape=butterfly,
+            )
+            
+            # Layer 4: Flower Petals
+            p = particles.batch(25)
+            px = cx + p.randint(-120, 120)
+            p_start = start + p.randint(0, dur)
+            p_end = p_start + p.randint(1500, 2000)
+            petals = format_events(
+                "Dialogue: 0,{start},{end},Default,lod2,0,0,0,,{{\\an5\\move({x0},{y0},{x1},{y1})\\fscx{size}\\fscy{size}\\1c{color}\\blur5\\frz0\\t(\\frz{frz})\\t(\\alpha&HFF&)}}🌸",
+                n, start=ass_times(p_start), end=ass_times(p_end),
+                x0=px, y0=cy - p.randint(80, 120), x1=px + p.randint(-40, 40), y1=cy + p.randint(80, 120),
+                size=p.randint(15, 30), color=p.choice(["&HFFC0CB&", "&HFF69B4&", "&HFFFFFF&"]), frz=p.randint(360, 720),
+            )
+            
+            # Layer 5: Sparkle Trail
+            p = particles.batch(30)
+            s_start = start + p.randint(0, dur)
+            life = p.randint(300, 600)
+            sparkles = format_events(
+                "Dialogue: 0,{start},{end},Default,lod1,0,0,0,,{{\\an5\\pos({x},{y})\\fscx{size}\\fscy{size}\\1c&HFFFF00&\\blur3\\t(0,{half},\\alpha&H00&)\\t({half},{life},\\alpha&HFF&)\\frz0\\t(\\frz360)}}✨",
+                n, start=ass_times(s_start), end=ass_times(s_start + life),
+                x=cx + p.randint(-150, 150), y=cy + p.randint(-100, 100), size=p.randint(8, 18), half=life // 2, life=life,
+            )
+            
+            # Layer 6: Garden Breeze
+            i = np.arange(5)[None, :]
+            br_start = start + i * (dur // 5)
+            breeze = format_events(
+                "Dialogue: 0,{start},{end},Default,lod1,0,0,0,,{{\\an5\\pos({x},{y})\\fscx250\\fscy10\\1c&H00FF00&\\alpha&HD0&\\blur12\\t(\\fscx350\\alpha&HFF&)}}～",
+                n, start=ass_times(br_start), end=ass_times(br_start + 600), x=cx, y=cy + (i - 2) * 30,
+            )
+            
+            return [glow, spring, butterflies, petals, sparkles, breeze]
+        return r.batched_loop(build)
@@ -0,0 +1,11 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Cinematic Blur ---
+class CinematicBlur(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Blur in, sharp, blur out
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\blur20\\t(0,150,\\blur0)\\t({dur-150},{dur},\\blur20)\\fad(100,100)}}{word['text']}"]
+        return r.base_loop(effect)
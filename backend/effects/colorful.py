@@ -0,0 +1,33 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Colorful (Rainbow Cycle) ---
+class Colorful(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            # Cycle through rainbow colors
+            colors = ["&H0000FF&", "&H00FFFF&", "&H00FF00&", "&HFFFF00&", "&HFF0000&", "&HFF00FF&"]
+            step = dur // len(colors)
+            
+            color_transforms = ""
+            for i, color in enumerate(colors):
+                t_start = i * step
+                t_end = (i + 1) * step
+                color_transforms += f"\\t({t_start},{t_end},\\1c{color})"
+            
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fscx110\\fscy110\\blur3{color_transforms}\\fad(100,100)}}{word['text']}")
+            
+            # Color particles
+            for _ in range(10):
+                px = cx + r.rng.randint(-60, 60)
+                py = cy + r.rng.randint(-40, 40)
+                ex = px + r.rng.randint(-100, 100)
+                ey = py + r.rng.randint(-100, 100)
+                p_start = start + r.rng.randint(0, dur // 2)
+                p_end = p_start + r.rng.randint(400, 800)
+                p_color = r.rng.choice(colors)
+                res.append(f"Dialogue: 0,{ms_to_ass(p_start)},{ms_to_ass(p_end)},Default,lod1,0,0,0,,{{\\an5\\move({px},{py},{ex},{ey})\\1c{p_color}\\fscx15\\fscy15\\blur4\\fad(0,200)\\p1}}m 0 0 l 10 0 10 10 0 10{{\\p0}}")
+            return res
+        return r.base_loop(effect)
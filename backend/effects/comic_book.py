@@ -0,0 +1,12 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Comic Book ---
+class ComicBook(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Pop in with rotation, thick border
+            rot = r.rng.randint(-5, 5)
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\frz{rot}\\fscx50\\fscy50\\t(0,100,\\fscx110\\fscy110)\\t(100,150,\\fscx100\\fscy100)}}{word['text']}"]
+        return r.base_loop(effect)
@@ -0,0 +1,84 @@
+import numpy as np
+
+from ass_format import ass_times
+from effects.base import Effect
+from particles import format_events
+
+
+# --- COSMIC STARS 🌟 ---
+class CosmicStars(Effect):
+    def render(self, r) -> str:
+        star = "m 0 -20 l 5 -5 20 0 5 5 0 20 -5 5 -20 0 -5 -5"
+        
+        def build(cols, particles, cx, cy):
+            n = len(cols["text"])
+            start, end, dur, text = cols["start"], cols["end"], cols["dur"], cols["text"]
+            t_start, t_end = ass_times(start), ass_times(end)
+            
+            # Layer 1: Cosmic Glow
+            offset = np.array([[-4, 0, 4]])
+            glow = format_events(
+                "Dialogue: 0,{start},{end},Default,,0,0,0,,{{\\an5\\pos({x},{y})\\1c{color}\\blur25\\alpha&H60&\\t(0,{half},\\blur30)\\t({half},{dur},\\blur25)}}{text}",
+                n, start=t_start, end=t_end, x=cx + offset, y=cy + offset,
+                color=np.array([["&HFF00FF&", "&HFF00AA&", "&HFF0066&"]]), half=dur // 2, dur=dur, text=text,
+            )
+            
+            # Layer 2: Galaxy Text
+            galaxy = format_events(
+                "Dialogue: 1,{start},{end},Default,,0,0,0,,{{\\an5\\pos({x},{y})\\1c{color}\\bord2\\3c&HFFFFFF&\\blur2\\fscx115\\fscy115}}{text}",
+                n, start=t_start, end=t_end, x=cx + np.array([[0, 2, 4]]), y=cy + np.array([[0, 1, 2]]),
+                color=np.array([["&HFF00FF&", "&HFF00AA&", "&HFF0066&"]]), text=text,
+            )
+            
+            # Layer 3: Orbiting Stars
+            p = particles.batch(25)
+            orbit_angle_start = np.arange(25) * 360 / 25 + p.randint(-20, 20)
+            orbit_angle_end = orbit_angle_start + p.choice([360, -360, 720])
+            radius = p.randint(80, 150)
+            angle_start_rad = np.radians(orbit_angle_start)
+            angle_end_rad = np.radians(orbit_angle_end)
+            s_start = start + p.randint(0, dur // 3)
+            s_end = s_start + p.randint(1000, 1500)
+            orbit = format_events(
+                "Dialogue: 0,{start},{end},Default,lod3,0,0,0,,{{\\an5\\move({x0},{y0},{x1},{y1})\\fscx{size}\\fscy{size}\\1c{color}\\blur5\\frz0\\t(\\frz360)\\t(\\alpha&HFF&)\\p1}}{shape}{{\\p0}}",
+                n, start=ass_times(s_start), end=ass_times(s_end),
+                x0=cx + np.trunc(np.cos(angle_start_rad) * radius), y0=cy + np.trunc(np.sin(angle_start_rad) * radius),
+                x1=cx + np.trunc(np.cos(angle_end_rad) * radius), y1=cy + np.trunc(np.sin(angle_end_rad) * radius),
+                size=p.randint(25, 50), color=p.choice(["&HFFFFFF&", "&HFFFF00&", "&HFF00FF&", "&H00FFFF&"]), shape=star,
+            )
+            
+            # Layer 4: Stardust
+            p = particles.batch(40)
+            d_start = start + p.randint(0, dur)
+            life = p.randint(300, 600)
+            dust = format_events(
+                "Dialogue: 0,{start},{end},Default,lod1,0,0,0,,{{\\an5\\pos({x},{y})\\fscx{size}\\fscy{size}\\1c{color}\\blur2\\t(0,{half},\\alpha&H00&)\\t({half},{life},\\alpha&HFF&)}}✦",
+                n, start=ass_times(d_start), end=ass_times(d_start + life),
+                x=cx + p.randint(-150, 150), y=cy + p.randint(-100, 100), size=p.randint(3, 10),
+                color=p.choice(["&HFFFFFF&", "&HFFCCFF&", "&HCCFFFF&"]), half=life // 2, life=life,
+            )
+            
+            # Layer 5: Nebula Clouds
+            p = particles.batch(8)
+            nebula = format_events(
+                "Dialogue: 0,{start},{end},Default,lod2,0,0,0,,{{\\an5\\pos({x},{y})\\fscx{size}\\fscy{size}\\1c{color}\\alpha&HC0&\\blur30}}●",
+                n, start=t_start, end=t_end,
+                x=cx + p.randint(-120, 120), y=cy + p.randint(-80, 80), size=p.randint(80, 140),
+                color=p.choice(["&HFF00FF&", "&HFF0088&", "&H8800FF&"]),
+            )
+            
+            # Layer 6: Shooting Stars
+            p = particles.batch(6)
+            shoot_x_start = cx + p.randint(-200, 200)
+            shoot_y_start = cy - p.randint(100, 150)
+            sh_start = start + p.randint(0, dur)
+            sh_end = sh_start + p.randint(400, 700)
+            shooting = format_events(
+                "Dialogue: 0,{start},{end},Default,lod2,0,0,0,,{{\\an5\\move({x0},{y0},{x1},{y1})\\1c&HFFFFFF&\\blur8\\fscx80\\fscy3\\frz45\\t(\\alpha&HFF&)}}━",
+                n, start=ass_times(sh_start), end=ass_times(sh_end),
+                x0=shoot_x_start, y0=shoot_y_start,
+                x1=shoot_x_start + p.randint(100, 200), y1=shoot_y_start + p.randint(100, 200),
+            )
+            
+            return [glow, galaxy, orbit, dust, nebula, shooting]
+        return r.batched_loop(build)
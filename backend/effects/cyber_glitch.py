@@ -0,0 +1,24 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Cyber Glitch ---
+class CyberGlitch(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            # RGB Split Layers
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx-3},{cy})\\1c&H0000FF&\\t(\\pos({cx+3},{cy}))}}{word['text']}")
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx+3},{cy})\\1c&HFF0000&\\t(\\pos({cx-3},{cy}))}}{word['text']}")
+            
+            # Jittery Main Layer
+            jitter = ""
+            curr = 0
+            while curr < dur:
+                step = r.rng.randint(40, 90)
+                sc = r.rng.randint(90, 110)
+                jitter += f"\\t({curr},{curr+step},\\fscx{sc}\\fscy{sc})"
+                curr += step
+            res.append(f"Dialogue: 2,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy}){jitter}}}{word['text']}")
+            return res
+        return r.base_loop(effect)
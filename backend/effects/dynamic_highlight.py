@@ -0,0 +1,71 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+from render_engine import ACTIVE, hex_to_ass
+
+
+# --- DYNAMIC HIGHLIGHT (2-4 Words with Color Transition) ---
+class DynamicHighlight(Effect):
+    def render(self, r) -> str:
+        """
+        Shows 2-4 words at once. Most words are in normal color/style,
+        but the currently spoken word is highlighted with a different color.
+        Color transition is smooth (with effect).
+        No position animation - only color changes.
+        """
+        cx, cy = r.anchor()
+        n = len(r.words)
+        
+        # Get colors from style
+        normal_color = hex_to_ass(r.style.get("primary_color", "&H00FFFFFF"))
+        highlight_color = hex_to_ass(r.style.get("secondary_color", "&H0000FFFF"))
+        
+        # Determine group size (2-4 words)
+        min_words = 2
+        max_words = 4
+        
+        def window(i):
+            # Calculate how many words to show before and after
+            words_before = min(i, max_words - 1)
+            words_after = min(n - i - 1, max_words - 1)
+            
+            # Adjust to keep total between min_words and max_words
+            total_words = 1 + words_before + words_after
+            if total_words > max_words:
+                # Reduce to fit max_words
+                excess = total_words - max_words
+                if words_after > words_before:
+                    words_after -= excess
+                else:
+                    words_before -= excess
+            elif total_words < min_words:
+                # Try to add more words
+                needed = min_words - total_words
+                if i > 0 and words_before < max_words - 1:
+                    add_before = min(needed, i - words_before)
+                    words_before += add_before
+                    needed -= add_before
+                if needed > 0 and words_after < max_words - 1:
+                    add_after = min(needed, n - i - 1 - words_after)
+                    words_after += add_after
+            return max(0, i - words_before), min(n, i + 1 + words_after)
+        
+        def fragment(j, state):
+            word = r.words[j]
+            if state != ACTIVE:
+                return f"{{\\1c{normal_color}}}{word['text']}"
+            # Current word (highlighted with smooth transition)
+            # Transition: normal -> highlight -> normal
+            dur = int(word['end'] * 1000) - int(word['start'] * 1000)
+            transition_time = min(dur, 300)  # Max 300ms for transition
+            return f"{{\\1c{normal_color}\\t(0,{transition_time//2},\\1c{highlight_color})\\t({dur-transition_time//2},{dur},\\1c{normal_color})}}{word['text']}"
+        
+        def compose(i, lo, parts):
+            word = r.words[i]
+            start_ms = int(word['start'] * 1000)
+            end_ms = int(word['end'] * 1000)
+            full_text = " ".join(parts)
+            
+            # Create dialogue line (no position animation, just color transitions)
+            return [f"Dialogue: 1,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(100,100)}}{full_text}"]
+
+        return r.window_loop(window, fragment, compose, context=3)
@@ -0,0 +1,18 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Earthquake Shake ---
+class EarthquakeShake(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Violent rotation shake
+            shake = ""
+            curr = 0
+            while curr < dur:
+                angle = r.rng.randint(-5, 5)
+                step = 40
+                shake += f"\\t({curr},{curr+step},\\frz{angle})"
+                curr += step
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy}){shake}}}{word['text']}"]
+        return r.base_loop(effect)
@@ -0,0 +1,23 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Electric Shock ---
+class ElectricShock(Effect):
+    def render(self, r) -> str:
+        lightning_shape = "m 0 0 l 5 20 l -3 20 l 8 40 l -10 25 l 0 25"
+        
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            shake = "".join([f"\\t({i*50},{(i+1)*50},\\frz{r.rng.randint(-3,3)})" for i in range(min(dur//50, 10))])
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\1c&HFFFF00&{shake}}}{word['text']}")
+            
+            for _ in range(6):
+                lx = cx + r.rng.randint(-80, 80)
+                ly = cy + r.rng.randint(-60, 60)
+                l_start = start + r.rng.randint(0, dur//2)
+                l_end = l_start + r.rng.randint(50, 150)
+                rotation = r.rng.randint(0, 360)
+                res.append(f"Dialogue: 0,{ms_to_ass(l_start)},{ms_to_ass(l_end)},Default,lod1,0,0,0,,{{\\an5\\pos({lx},{ly})\\frz{rotation}\\1c&HFFFF00&\\fscx80\\fscy80\\fad(0,50)\\p1}}{lightning_shape}{{\\p0}}")
+            return res
+        return r.base_loop(effect)
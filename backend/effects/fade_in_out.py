@@ -0,0 +1,23 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Fade In Out (sentence) ---
+class FadeInOut(Effect):
+    def render(self, r) -> str:
+        alignment = int(r.style.get("alignment", 2))
+        screen_h = 1080
+        cx = 1920 // 2
+        cy = screen_h - 150 if alignment == 2 else (150 if alignment == 8 else screen_h // 2)
+        
+        sentence_length = 5
+        def effect_at(sent_start):
+            sent_words = r.words[sent_start:sent_start + sentence_length]
+                
+            start_ms = int(sent_words[0]['start'] * 1000)
+            end_ms = int(sent_words[-1]['end'] * 1000)
+            full_text = " ".join([w['text'] for w in sent_words])
+            
+            return [f"Dialogue: 1,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(400,400)}}{full_text}"]
+        
+        return r.indexed_loop(effect_at, step=sentence_length)
@@ -0,0 +1,27 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Falling Heart ---
+class FallingHeart(Effect):
+    def render(self, r) -> str:
+        heart_shape = "m 18 40 b 23 29 35 27 35 16 b 36 8 23 0 18 11 b 14 0 0 8 1 16 b 1 27 14 29 18 40"
+        
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            # Main text falling and rotating
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\move({cx},{cy-50},{cx},{cy})\\frz{r.rng.randint(-20, 20)}\\t(\\frz0)\\fad(300,100)}}{word['text']}")
+            
+            # Falling hearts
+            for _ in range(15):
+                hx = cx + r.rng.randint(-80, 80)
+                hy = cy - r.rng.randint(50, 100)
+                ey = cy + r.rng.randint(50, 150)
+                h_start = start + r.rng.randint(0, dur)
+                h_end = h_start + r.rng.randint(1000, 1500)
+                size = r.rng.randint(20, 40)
+                rotation = r.rng.choice([-500, 500, -700, 700])
+                color = r.rng.choice(["&HFF69B4&", "&HFF1493&", "&HFF00FF&"])
+                res.append(f"Dialogue: 0,{ms_to_ass(h_start)},{ms_to_ass(h_end)},Default,lod1,0,0,0,,{{\\an5\\move({hx},{hy},{hx + r.rng.randint(-50, 50)},{ey})\\fscx{size}\\fscy{size}\\1c{color}\\blur5\\frz0\\t(\\frz{rotation})\\fad(300,300)\\p1}}{heart_shape}{{\\p0}}")
+            return res
+        return r.base_loop(effect)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from ass_format import ass_times
+from effects.base import Effect
+from particles import format_events
+
+
+# --- Fire Storm ---
+class FireStorm(Effect):
+    def render(self, r) -> str:
+        star_shape = "m 30 23 b 24 23 24 33 30 33 b 36 33 37 23 30 23 m 35 27 l 61 28 l 35 29 m 26 27 l 0 28 l 26 29"
+        
+        def build(cols, particles, cx, cy):
+            n = len(cols["text"])
+            start, end, dur = cols["start"], cols["end"], cols["dur"]
+            # Main Text
+            text = format_events(
+                "Dialogue: 1,{start},{end},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(100,100)\\blur5\\t(0,{dur},\\fscx110\\fscy110\\blur10)}}{text}",
+                n, start=ass_times(start), end=ass_times(end), cx=cx, cy=cy, dur=dur, text=cols["text"],
+            )
+            
+            # Particles
+            p = particles.batch(12)
+            angle = np.radians(p.uniform(0, 360))
+            speed = p.uniform(30, 120)
+            sx = cx + p.uniform(-40, 40)
+            sy = cy + p.uniform(-10, 10)
+            ex = sx + np.cos(angle) * speed
+            ey = sy + np.sin(angle) * speed
+            p_start = start + p.randint(0, np.maximum(0, dur - 200))
+            p_end = p_start + p.randint(300, 600)
+            color = p.choice(["&H0000FF&", "&H00FFFF&", "&HFFFFFF&"])
+            sparks = format_events(
+                "Dialogue: 0,{start},{end},Default,lod1,0,0,0,,{{\\an5\\move({sx},{sy},{ex},{ey})\\fad(0,200)\\blur2\\1c{color}\\bord0\\p1\\t(\\fscx0\\fscy0)}}{shape}{{\\p0}}",
+                n, start=ass_times(p_start), end=ass_times(p_end), sx=sx, sy=sy, ex=ex, ey=ey, color=color, shape=star_shape,
+            )
+            return [text, sparks]
+        return r.batched_loop(build)
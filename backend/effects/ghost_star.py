@@ -0,0 +1,31 @@
+import math
+
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Ghost Star ---
+class GhostStar(Effect):
+    def render(self, r) -> str:
+        star_shape = "m 30 23 b 24 23 24 33 30 33 b 36 33 37 23 30 23 m 35 27 l 61 28 l 35 29 m 26 27 l 0 28 l 26 29"
+        
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            # Main text with glow
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\blur8\\fscx105\\fscy105\\t(\\blur2\\fscx100\\fscy100)\\fad(150,150)}}{word['text']}")
+            
+            # Ghost stars floating around
+            for _ in range(12):
+                sx = cx + r.rng.randint(-100, 100)
+                sy = cy + r.rng.randint(-80, 80)
+                angle = r.rng.uniform(0, 360)
+                distance = r.rng.uniform(80, 150)
+                ex = sx + math.cos(math.radians(angle)) * distance
+                ey = sy + math.sin(math.radians(angle)) * distance
+                s_start = start + r.rng.randint(0, dur)
+                s_end = s_start + r.rng.randint(800, 1200)
+                size = r.rng.randint(15, 35)
+                star_color = r.rng.choice(["&HFFFFFF&", "&HFFFF00&", "&H00FFFF&"])
+                res.append(f"Dialogue: 0,{ms_to_ass(s_start)},{ms_to_ass(s_end)},Default,lod1,0,0,0,,{{\\an5\\move({int(sx)},{int(sy)},{int(ex)},{int(ey)})\\fscx{size}\\fscy{size}\\1c{star_color}\\blur6\\frz0\\t(\\frz360)\\fad(200,300)\\p1}}{star_shape}{{\\p0}}")
+            return res
+        return r.base_loop(effect)
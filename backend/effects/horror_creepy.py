@@ -0,0 +1,18 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Horror Creepy ---
+class HorrorCreepy(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Shaky, red, blur in
+            shake = ""
+            curr = 0
+            while curr < dur:
+                ox = r.rng.randint(-2, 2)
+                oy = r.rng.randint(-2, 2)
+                shake += f"\\t({curr},{curr+50},\\fscx{r.rng.randint(95,105)}\\fscy{r.rng.randint(95,105)}\\pos({cx+ox},{cy+oy}))"
+                curr += 50
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\blur3\\t(0,200,\\blur0){shake}}}{word['text']}"]
+        return r.base_loop(effect)
@@ -0,0 +1,81 @@
+import numpy as np
+
+from ass_format import ass_times
+from effects.base import Effect
+from particles import format_events
+
+
+# --- ICE CRYSTAL ❄️ ---
+class IceCrystal(Effect):
+    def render(self, r) -> str:
+        crystal_shape = "m 0 -20 l 5 -5 20 0 5 5 0 20 -5 5 -20 0 -5 -5"
+        snowflake = "m 0 -15 l 0 15 m -15 0 l 15 0 m -10 -10 l 10 10 m -10 10 l 10 -10"
+        
+        def build(cols, particles, cx, cy):
+            n = len(cols["text"])
+            start, end, dur, text = cols["start"], cols["end"], cols["dur"], cols["text"]
+            t_start, t_end = ass_times(start), ass_times(end)
+            
+            # Layer 1: Ice Glow
+            offset = np.array([[-3, 0, 3]])
+            glow = format_events(
+                "Dialogue: 0,{start},{end},Default,,0,0,0,,{{\\an5\\pos({x},{y})\\1c{color}\\blur18\\alpha&H70&}}{text}",
+                n, start=t_start, end=t_end, x=cx + offset, y=cy + offset,
+                color=np.array([["&HFFFF00&", "&HFFAA00&", "&HFF8800&"]]), text=text,
+            )
+            
+            # Layer 2: Frozen Text
+            offset = np.array([[0, 1, 2]])
+            frozen = format_events(
+                "Dialogue: 1,{start},{end},Default,,0,0,0,,{{\\an5\\pos({x},{y})\\1c&HFFFFFF&\\bord2\\3c&HDDFFFF&\\blur1\\fscx110\\fscy110}}{text}",
+                n, start=t_start, end=t_end, x=cx + offset, y=cy + offset, text=text,
+            )
+            
+            # Layer 3: Exploding Crystals
+            p = particles.batch(30)
+            angle_rad = np.radians(np.arange(30) * 360 / 30 + p.randint(-10, 10))
+            distance_start = 30
+            distance_end = p.randint(120, 200)
+            c_start = start + p.randint(0, dur // 3)
+            c_end = c_start + p.randint(600, 1000)
+            scale = p.randint(20, 50)
+            crystals = format_events(
+                "Dialogue: 0,{start},{end},Default,lod3,0,0,0,,{{\\an5\\move({x0},{y0},{x1},{y1})\\fscx{scale}\\fscy{scale}\\1c&HFFFFFF&\\blur4\\frz{frz0}\\t(\\frz{frz1})\\t(\\alpha&HFF&)\\p1}}{shape}{{\\p0}}",
+                n, start=ass_times(c_start), end=ass_times(c_end),
+                x0=cx + np.trunc(np.cos(angle_rad) * distance_start), y0=cy + np.trunc(np.sin(angle_rad) * distance_start),
+                x1=cx + np.trunc(np.cos(angle_rad) * distance_end), y1=cy + np.trunc(np.sin(angle_rad) * distance_end),
+                scale=scale, frz0=p.randint(0, 360), frz1=p.randint(360, 720), shape=crystal_shape,
+            )
+            
+            # Layer 4: Frost Particles
+            p = particles.batch(25)
+            p_start = start + p.randint(0, dur)
+            life = p.randint(400, 800)
+            frost = format_events(
+                "Dialogue: 0,{start},{end},Default,lod1,0,0,0,,{{\\an5\\pos({x},{y})\\fscx{size}\\fscy{size}\\1c&HDDFFFF&\\blur2\\t(0,{half},\\alpha&H00&)\\t({half},{life},\\alpha&HFF&)}}●",
+                n, start=ass_times(p_start), end=ass_times(p_start + life),
+                x=cx + p.randint(-150, 150), y=cy + p.randint(-100, 100), size=p.randint(5, 15), half=life // 2, life=life,
+            )
+            
+            # Layer 5: Snowflakes
+            p = particles.batch(12)
+            s_start = start + p.randint(0, dur // 2)
+            s_end = s_start + p.randint(1000, 1500)
+            flakes = format_events(
+                "Dialogue: 0,{start},{end},Default,lod2,0,0,0,,{{\\an5\\pos({x},{y})\\fscx{size}\\fscy{size}\\1c&HFFFFFF&\\blur3\\frz0\\t(\\frz360)\\p1}}{shape}{{\\p0}}",
+                n, start=ass_times(s_start), end=ass_times(s_end),
+                x=cx + p.randint(-100, 100), y=cy + p.randint(-80, 80), size=p.randint(25, 45), shape=snowflake,
+            )
+            
+            # Layer 6: Ice Shards
+            shard_shape = "m 0 0 l 3 -25 l 6 0"
+            angle = np.arange(8)[None, :] * 45
+            shards = format_events(
+                "Dialogue: 0,{start},{end},Default,lod2,0,0,0,,{{\\an5\\pos({x},{y})\\frz{angle}\\fscx80\\fscy80\\1c&HFFFFFF&\\blur2\\t(\\fscx0\\fscy0\\alpha&HFF&)\\p1}}{shape}{{\\p0}}",
+                n, start=t_start, end=ass_times(start + 400),
+                x=cx + np.trunc(np.cos(np.radians(angle)) * 60), y=cy + np.trunc(np.sin(np.radians(angle)) * 60),
+                angle=angle, shape=shard_shape,
+            )
+            
+            return [glow, frozen, crystals, frost, flakes, shards]
+        return r.batched_loop(build)
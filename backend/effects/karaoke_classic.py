@@ -0,0 +1,28 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Karaoke Classic (3 words) ---
+class KaraokeClassic(Effect):
+    def render(self, r) -> str:
+        alignment = int(r.style.get("alignment", 2))
+        screen_h = 1080
+        cx = 1920 // 2
+        cy = screen_h - 150 if alignment == 2 else (150 if alignment == 8 else screen_h // 2)
+        
+        def effect_at(i):
+            word = r.words[i]
+            start_ms = int(word['start'] * 1000)
+            end_ms = int(word['end'] * 1000)
+            
+            text_parts = []
+            if i > 0:
+                text_parts.append(f"{{\\alpha&HA0&\\fscx85\\fscy85}}{r.words[i-1]['text']}")
+            text_parts.append(f"{{\\alpha&H00&\\fscx130\\fscy130\\1c&HFFFF00&\\blur4}}{word['text']}")
+            if i < len(r.words) - 1:
+                text_parts.append(f"{{\\alpha&HA0&\\fscx85\\fscy85}}{r.words[i+1]['text']}")
+            
+            full_text = " ".join(text_parts)
+            return [f"Dialogue: 1,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(80,80)}}{full_text}"]
+        
+        return r.indexed_loop(effect_at, context=1)
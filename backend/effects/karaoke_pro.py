@@ -0,0 +1,48 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+from render_engine import ACTIVE, PAST, hex_to_ass
+
+
+# --- Karaoke Pro (Past/Present/Future) ---
+class KaraokePro(Effect):
+    def render(self, r) -> str:
+        """
+        Renders a sliding window of words around the spoken one.
+        Past words get color_past/outline_past.
+        Present word gets primary_color/outline_color + animation.
+        Future words get color_future/outline_future.
+        """
+        cx, cy = r.anchor()
+        window_size = 12
+        n = len(r.words)
+
+        past_tag = f"{{\\1c{r.color_past}\\3c{r.outline_past}}}"
+        future_tag = f"{{\\1c{r.color_future}\\3c{r.outline_future}}}"
+        p_color = hex_to_ass(r.style.get("primary_color", "&H00FFFFFF"))
+        o_color = hex_to_ass(r.style.get("outline_color", "&H00000000"))
+
+        def window(i):
+            # Centred on the active word, shifted back at the end to stay window_size long
+            start_idx = max(0, i - window_size // 2)
+            end_idx = min(n, start_idx + window_size)
+            if end_idx - start_idx < window_size:
+                start_idx = max(0, end_idx - window_size)
+            return start_idx, end_idx
+
+        def fragment(j, state):
+            w = r.words[j]
+            if state == PAST:
+                return f"{past_tag}{w['text']}"
+            if state == ACTIVE:
+                dur = int(w['end'] * 1000) - int(w['start'] * 1000)
+                return f"{{\\1c{p_color}\\3c{o_color}\\t(0,100,\\fscx115\\fscy115)\\t(100,{dur},\\fscx100\\fscy100)}}{w['text']}"
+            return f"{future_tag}{w['text']}"
+
+        def compose(i, lo, parts):
+            word = r.words[i]
+            start_ms = int(word['start'] * 1000)
+            end_ms = int(word['end'] * 1000)
+            full_text = " ".join(parts)
+            return [f"Dialogue: 1,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(0,0)}}{full_text}"]
+
+        return r.window_loop(window, fragment, compose, context=window_size)
@@ -0,0 +1,12 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Kinetic Bounce ---
+class KineticBounce(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Drop from top, bounce
+            # Start high, hit Cy, squash, recover
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\move({cx},{cy-100},{cx},{cy},0,150)\\t(150,250,\\fscx120\\fscy80)\\t(250,400,\\fscx100\\fscy100)}}{word['text']}"]
+        return r.base_loop(effect)
@@ -0,0 +1,13 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Luxury Gold ---
+class LuxuryGold(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Elegant fade in, slight scale up, gold color (handled by style prop mostly)
+            # We add a shine effect using clip or just a highlight color transform
+            shine = "\\t(0,100,\\1c&HFFFFFF&)\\t(100,300,\\1c&H00D7FF&)" # White to Gold
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(100,100){shine}}}{word['text']}"]
+        return r.base_loop(effect)
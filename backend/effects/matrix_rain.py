@@ -0,0 +1,22 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Matrix Rain ---
+class MatrixRain(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\1c&H00FF00&\\fad(100,100)}}{word['text']}")
+            
+            chars = "01アイウエオカキクケコ"
+            for _ in range(15):
+                char = r.rng.choice(chars)
+                x = cx + r.rng.randint(-200, 200)
+                y_start = cy - r.rng.randint(200, 400)
+                y_end = cy + r.rng.randint(100, 300)
+                c_start = start + r.rng.randint(0, dur)
+                c_end = c_start + r.rng.randint(500, 1000)
+                res.append(f"Dialogue: 0,{ms_to_ass(c_start)},{ms_to_ass(c_end)},Default,lod1,0,0,0,,{{\\an5\\move({x},{y_start},{x},{y_end})\\1c&H00FF00&\\alpha&H80&\\fscx50\\fscy50\\fad(0,200)}}{char}")
+            return res
+        return r.base_loop(effect)
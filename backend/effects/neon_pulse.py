@@ -0,0 +1,13 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Neon Pulse ---
+class NeonPulse(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Pulse up and down
+            mid = dur // 2
+            anim = f"\\t(0,{mid},\\fscx115\\fscy115\\blur10)\\t({mid},{dur},\\fscx100\\fscy100\\blur2)"
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(50,50){anim}}}{word['text']}"]
+        return r.base_loop(effect)
@@ -0,0 +1,21 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Neon Sign ---
+class NeonSign(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            flicker = ""
+            t = 0
+            while t < min(dur, 1000):
+                if r.rng.random() < 0.3:
+                    flicker += f"\\t({t},{t+50},\\alpha&HFF&)\\t({t+50},{t+100},\\alpha&H00&)"
+                    t += 100
+                else:
+                    t += 100
+            
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\1c&HFF00FF&\\3c&HFF00FF&\\bord3\\blur5{flicker}}}{word['text']}")
+            return res
+        return r.base_loop(effect)
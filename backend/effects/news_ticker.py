@@ -0,0 +1,13 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- News Ticker ---
+class NewsTicker(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Typewriter style or just simple appear with a background box
+            # ASS doesn't support auto-background box easily without drawing shapes.
+            # We will just do a clean slide up.
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\move({cx},{cy+20},{cx},{cy},0,100)}}{word['text']}"]
+        return r.base_loop(effect)
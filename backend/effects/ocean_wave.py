@@ -0,0 +1,66 @@
+import math
+
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- OCEAN WAVE 🌊 ---
+class OceanWave(Effect):
+    def render(self, r) -> str:
+        bubble = "m 0 16 b 0 16 0 16 0 16 b 0 16 0 16 0 16 b 0 16 0 16 0 16 b 0 16 0 16 0 16 b 0 0 20 0 20 16 b 20 16 20 16 20 16 b 20 33 0 33 0 16"
+        
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            
+            # Layer 1: Water Glow
+            water_colors = ["&HFF8800&", "&HFFAA00&", "&HFFCC00&"]
+            for i, color in enumerate(water_colors):
+                offset = (i - 1) * 3
+                res.append(f"Dialogue: 0,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx + offset},{cy + offset})\\1c{color}\\blur20\\alpha&H70&}}{word['text']}")
+            
+            # Layer 2: Wavy Text
+            wave_count = 5
+            for i in range(wave_count):
+                wave_offset = int(math.sin((i / wave_count) * math.pi * 2) * 10)
+                res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy + wave_offset})\\1c&H00CCFF&\\bord2\\3c&H0088FF&\\blur1}}{word['text']}")
+            
+            # Layer 3: Wave Particles
+            for i in range(40):
+                angle = (i * 360 / 40)
+                radius = r.rng.randint(60, 120)
+                angle_rad = math.radians(angle)
+                wx = cx + int(math.cos(angle_rad) * radius)
+                wy = cy + int(math.sin(angle_rad) * radius) + int(math.sin(angle_rad * 3) * 20)
+                w_start = start + r.rng.randint(0, dur//2)
+                w_end = w_start + r.rng.randint(800, 1200)
+                w_size = r.rng.randint(15, 35)
+                res.append(f"Dialogue: 0,{ms_to_ass(w_start)},{ms_to_ass(w_end)},Default,lod2,0,0,0,,{{\\an5\\pos({wx},{wy})\\fscx{w_size}\\fscy{w_size}\\1c&H00AAFF&\\blur4\\t(\\alpha&HFF&)}}●")
+            
+            # Layer 4: Bubbles
+            for _ in range(20):
+                bx = cx + r.rng.randint(-100, 100)
+                by_start = cy + r.rng.randint(40, 80)
+                by_end = cy - r.rng.randint(80, 120)
+                b_start = start + r.rng.randint(0, dur)
+                b_end = b_start + r.rng.randint(1000, 1500)
+                b_size = r.rng.randint(20, 40)
+                res.append(f"Dialogue: 0,{ms_to_ass(b_start)},{ms_to_ass(b_end)},Default,lod1,0,0,0,,{{\\an5\\move({bx},{by_start},{bx + r.rng.randint(-20,20)},{by_end})\\fscx{b_size}\\fscy{b_size}\\1c&H00DDFF&\\blur5\\t(\\alpha&HFF&)\\p1}}{bubble}{{\\p0}}")
+            
+            # Layer 5: Foam
+            for _ in range(15):
+                fx = cx + r.rng.randint(-120, 120)
+                fy = cy + r.rng.randint(-40, 40)
+                f_start = start + r.rng.randint(0, dur)
+                f_end = f_start + r.rng.randint(400, 700)
+                f_size = r.rng.randint(10, 25)
+                res.append(f"Dialogue: 0,{ms_to_ass(f_start)},{ms_to_ass(f_end)},Default,lod1,0,0,0,,{{\\an5\\pos({fx},{fy})\\fscx{f_size}\\fscy{f_size}\\1c&HFFFFFF&\\alpha&H40&\\blur8\\t(\\fscx{f_size*2}\\alpha&HFF&)}}●")
+            
+            # Layer 6: Wave Lines
+            for i in range(3):
+                wave_y = cy + (i - 1) * 40
+                w_start = start + i * (dur // 3)
+                w_end = w_start + 500
+                res.append(f"Dialogue: 0,{ms_to_ass(w_start)},{ms_to_ass(w_end)},Default,lod3,0,0,0,,{{\\an5\\pos({cx},{wave_y})\\fscx300\\fscy15\\1c&H00AAFF&\\alpha&H80&\\blur10\\t(\\fscx400\\alpha&HFF&)}}～")
+            
+            return res
+        return r.base_loop(effect)
@@ -0,0 +1,18 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Pixel Glitch ---
+class PixelGlitch(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            colors = ["&HFF0000&", "&H00FF00&", "&H0000FF&", "&HFFFFFF&"]
+            for i, color in enumerate(colors):
+                offset_x = r.rng.randint(-5, 5)
+                offset_y = r.rng.randint(-3, 3)
+                glitch_count = min(dur//100, 8)
+                glitch_times = "".join([f"\\t({j*100},{(j+1)*100},\\pos({cx + r.rng.randint(-10,10)},{cy + r.rng.randint(-5,5)}))" for j in range(glitch_count)])
+                res.append(f"Dialogue: {i},{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx + offset_x},{cy + offset_y})\\1c{color}\\alpha&H60&{glitch_times}}}{word['text']}")
+            return res
+        return r.base_loop(effect)
@@ -0,0 +1,23 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Pulse (Karaoke) ---
+class Pulse(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            # Main text with pulsing effect
+            mid = dur // 2
+            pulse = f"\\t(0,{mid},\\fscx115\\fscy115\\blur10)\\t({mid},{dur},\\fscx100\\fscy100\\blur2)"
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(50,50){pulse}}}{word['text']}")
+            
+            # Add expanding rings
+            for i in range(3):
+                ring_start = start + i * 100
+                ring_end = ring_start + 600
+                scale_start = 100 + i * 20
+                scale_end = 350 + i * 50
+                res.append(f"Dialogue: 0,{ms_to_ass(ring_start)},{ms_to_ass(ring_end)},Default,lod1,0,0,0,,{{\\an5\\pos({cx},{cy})\\1a&HFF&\\3c&HFFFFFF&\\bord2\\fscx{scale_start}\\fscy{scale_start}\\t(\\fscx{scale_end}\\fscy{scale_end}\\alpha&HFF&)\\p1}}m 0 -15 b -21 -15 -21 16 0 16 b 23 16 23 -15 0 -15{{\\p0}}")
+            return res
+        return r.base_loop(effect)
@@ -0,0 +1,13 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Rainbow Wave ---
+class RainbowWave(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Cycle colors: Red -> Green -> Blue -> Red
+            rainbow = "\\t(0,33,\\1c&H00FF00&)\\t(33,66,\\1c&HFF0000&)\\t(66,100,\\1c&H0000FF&)"
+            # Note: ASS color interpolation is linear, so this is approximate
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(50,50){rainbow}}}{word['text']}"]
+        return r.base_loop(effect)
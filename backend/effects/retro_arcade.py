@@ -0,0 +1,12 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Retro Arcade ---
+class RetroArcade(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Instant appearance, no fade, maybe a blink at end
+            # Green text, pixel font assumed
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})}}{word['text']}"]
+        return r.base_loop(effect)
@@ -0,0 +1,23 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Smoke Trail ---
+class SmokeTrail(Effect):
+    def render(self, r) -> str:
+        smoke_shape = "m 0 0 b 10 -5 20 -5 30 0 b 20 5 10 5 0 0"
+        
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(100,300)\\t({max(dur-200,0)},{dur},\\alpha&HFF&\\blur10)}}{word['text']}")
+            
+            for _ in range(10):
+                sx = cx + r.rng.randint(-40, 40)
+                sy = cy + r.rng.randint(-20, 20)
+                ey = sy - r.rng.randint(50, 100)
+                s_start = start + r.rng.randint(max(dur//2,0), dur)
+                s_end = s_start + r.rng.randint(800, 1200)
+                size = r.rng.randint(30, 60)
+                res.append(f"Dialogue: 0,{ms_to_ass(s_start)},{ms_to_ass(s_end)},Default,lod1,0,0,0,,{{\\an5\\move({sx},{sy},{sx + r.rng.randint(-30,30)},{ey})\\fscx{size}\\fscy{size}\\1c&HCCCCCC&\\alpha&H40&\\blur8\\t(\\alpha&HFF&\\fscx{size*2}\\fscy{size*2})\\p1}}{smoke_shape}{{\\p0}}")
+            return res
+        return r.base_loop(effect)
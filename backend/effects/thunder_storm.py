@@ -0,0 +1,63 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- THUNDER STORM ⚡ ---
+class ThunderStorm(Effect):
+    def render(self, r) -> str:
+        lightning = "m 0 0 l 5 20 l -3 20 l 8 40 l -10 25 l 0 25"
+        
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            
+            # Layer 1: Storm Clouds
+            for i in range(5):
+                cloud_x = cx + r.rng.randint(-150, 150)
+                cloud_y = cy - r.rng.randint(80, 120)
+                cloud_size = r.rng.randint(60, 100)
+                res.append(f"Dialogue: 0,{ms_to_ass(start)},{ms_to_ass(end)},Default,lod3,0,0,0,,{{\\an5\\pos({cloud_x},{cloud_y})\\fscx{cloud_size}\\fscy{cloud_size}\\1c&H404040&\\alpha&H60&\\blur20}}●")
+            
+            # Layer 2: Electric Text
+            for flash in range(3):
+                flash_start = start + flash * (dur // 3)
+                flash_end = flash_start + 100
+                res.append(f"Dialogue: 1,{ms_to_ass(flash_start)},{ms_to_ass(flash_end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\1c&HFFFFFF&\\bord3\\3c&HFFFF00&\\blur5}}{word['text']}")
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\1c&H00FFFF&\\bord2\\3c&H0000FF&\\blur2}}{word['text']}")
+            
+            # Layer 3: Lightning Bolts
+            for _ in range(15):
+                lx = cx + r.rng.randint(-120, 120)
+                ly = cy - r.rng.randint(100, 150)
+                l_start = start + r.rng.randint(0, dur)
+                l_end = l_start + r.rng.randint(50, 150)
+                rotation = r.rng.randint(-30, 30)
+                scale = r.rng.randint(80, 150)
+                res.append(f"Dialogue: 0,{ms_to_ass(l_start)},{ms_to_ass(l_end)},Default,lod3,0,0,0,,{{\\an5\\pos({lx},{ly})\\frz{rotation}\\fscx{scale}\\fscy{scale}\\1c&HFFFF00&\\blur3\\fad(0,50)\\p1}}{lightning}{{\\p0}}")
+            
+            # Layer 4: Electric Sparks
+            for _ in range(30):
+                sx = cx + r.rng.randint(-100, 100)
+                sy = cy + r.rng.randint(-60, 60)
+                s_end_x = sx + r.rng.randint(-40, 40)
+                s_end_y = sy + r.rng.randint(-40, 40)
+                s_start = start + r.rng.randint(0, dur)
+                s_end = s_start + r.rng.randint(100, 300)
+                res.append(f"Dialogue: 0,{ms_to_ass(s_start)},{ms_to_ass(s_end)},Default,lod1,0,0,0,,{{\\an5\\move({sx},{sy},{s_end_x},{s_end_y})\\1c&H00FFFF&\\blur2\\fscx5\\fscy5}}●")
+            
+            # Layer 5: Rain
+            for _ in range(20):
+                rx = cx + r.rng.randint(-200, 200)
+                ry_start = cy - r.rng.randint(150, 200)
+                ry_end = cy + r.rng.randint(100, 150)
+                r_start = start + r.rng.randint(0, dur)
+                r_end = r_start + r.rng.randint(400, 600)
+                res.append(f"Dialogue: 0,{ms_to_ass(r_start)},{ms_to_ass(r_end)},Default,lod1,0,0,0,,{{\\an5\\move({rx},{ry_start},{rx},{ry_end})\\1c&H808080&\\alpha&H80&\\fscx2\\fscy30\\blur1}}|")
+            
+            # Layer 6: Flash
+            for i in range(4):
+                flash_start = start + i * (dur // 4)
+                flash_end = flash_start + 80
+                res.append(f"Dialogue: 0,{ms_to_ass(flash_start)},{ms_to_ass(flash_end)},Default,lod2,0,0,0,,{{\\an5\\pos({cx},{cy})\\fscx400\\fscy400\\1c&HFFFFFF&\\alpha&H00&\\blur30\\t(\\alpha&HFF&)}}●")
+            
+            return res
+        return r.base_loop(effect)
@@ -0,0 +1,12 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Thunder Strike ---
+class ThunderStrike(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Flash border color
+            flash = f"\\t(0,50,\\3c&HFFFFFF&)\\t(50,100,\\3c&H000000&)\\t(100,150,\\3c&HFFFFFF&)\\t(150,200,\\3c&H000000&)"
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(50,50){flash}\\fscx110\\fscy110}}{word['text']}"]
+        return r.base_loop(effect)
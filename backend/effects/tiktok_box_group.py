@@ -0,0 +1,110 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+from render_engine import ACTIVE, hex_to_ass
+
+
+# --- TikTok Box Group (3 Words with Line Wrap) ---
+class TiktokBoxGroup(Effect):
+    def render(self, r) -> str:
+        alignment = int(r.style.get("alignment", 2))
+        screen_h = 1080
+        screen_w = 1920
+        cx = screen_w // 2
+        cy = screen_h - 150 if alignment == 2 else (150 if alignment == 8 else screen_h // 2)
+        
+        max_line_width = screen_w - 200  # Leave margins
+        
+        # Get Dynamic Styles
+        active_color = hex_to_ass(r.style.get("secondary_color", "&H0000FFFF")) # Default Yellowish
+        passive_color = hex_to_ass(r.style.get("primary_color", "&H00FFFFFF"))
+        box_color = hex_to_ass(r.style.get("active_bg_color", "&H00FFFF00")) # Default Cyan-ish box if not set
+        
+        # Scale logic
+        try:
+            active_scale = int(r.style.get("active_scale", 110))
+        except:
+            active_scale = 110
+            
+        passive_scale = 90
+        
+        n = len(r.words)
+        # Layout is measured in the style's font; 55 px per char if it is unavailable
+        char_width = 55
+
+        def window(i):
+            # Previous word, current word, next word
+            return max(0, i - 1), min(n, i + 2)
+
+        def fragment(j, state):
+            text = r.words[j]['text']
+            active = state == ACTIVE
+            return {'text': text, 'active': active, 'width': r.text_width(text, active_scale if active else passive_scale, char_width)}
+
+        def compose(i, lo, words_group):
+            word = r.words[i]
+            lines = []
+            start_ms = int(word['start'] * 1000)
+            end_ms = int(word['end'] * 1000)
+            dur = end_ms - start_ms
+            
+            spacing = 80
+            total_width = sum([w['width'] + spacing for w in words_group])
+            
+            if total_width > max_line_width:
+                # Multi-line layout
+                line_spacing = 120
+                start_y = cy - (len(words_group) - 1) * line_spacing // 2
+                
+                for idx, w in enumerate(words_group):
+                    word_y = start_y + idx * line_spacing
+                    word_x = cx
+                    
+                    if w['active']:
+                        text_width = w['width']
+                        box_w = text_width + 60
+                        box_h = 100
+                        radius = 15
+                        
+                        box_shape = f"m {radius} 0 l {box_w-radius} 0 b {box_w} 0 {box_w} {radius} {box_w} {radius} l {box_w} {box_h-radius} b {box_w} {box_h} {box_w-radius} {box_h} {box_w-radius} {box_h} l {radius} {box_h} b 0 {box_h} 0 {box_h-radius} 0 {box_h-radius} l 0 {radius} b 0 0 {radius} 0 {radius} 0"
+                        
+                        # Box (Background)
+                        # Only show box if color is not fully transparent
+                        if not box_color.startswith("&HFF"): 
+                            lines.append(f"Dialogue: 0,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({word_x},{word_y})\\p1\\1c{box_color}\\alpha&H20&\\blur2\\t(0,120,\\fscx105\\fscy105)\\t(120,{dur},\\fscx100\\fscy100)}}{box_shape}{{\\p0}}")
+                        
+                        # Active Text
+                        lines.append(f"Dialogue: 1,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({word_x},{word_y})\\1c{active_color}\\b1\\fscx{active_scale}\\fscy{active_scale}\\t(0,120,\\fscx{active_scale+10}\\fscy{active_scale+10})\\t(120,{dur},\\fscx{active_scale}\\fscy{active_scale})}}{w['text']}")
+                    else:
+                        # Passive Text
+                        lines.append(f"Dialogue: 1,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({word_x},{word_y})\\1c{passive_color}\\alpha&H60&\\fscx{passive_scale}\\fscy{passive_scale}}}{w['text']}")
+            else:
+                # Single line layout
+                start_x = cx - total_width // 2
+                current_x = start_x
+                
+                for w in words_group:
+                    word_width = w['width']
+                    word_x = current_x + word_width // 2
+                    
+                    if w['active']:
+                        text_width = w['width']
+                        box_w = text_width + 60
+                        box_h = 100
+                        radius = 15
+                        
+                        box_shape = f"m {radius} 0 l {box_w-radius} 0 b {box_w} 0 {box_w} {radius} {box_w} {radius} l {box_w} {box_h-radius} b {box_w} {box_h} {box_w-radius} {box_h} {box_w-radius} {box_h} l {radius} {box_h} b 0 {box_h} 0 {box_h-radius} 0 {box_h-radius} l 0 {radius} b 0 0 {radius} 0 {radius} 0"
+                        
+                        # Box
+                        if not box_color.startswith("&HFF"):
+                            lines.append(f"Dialogue: 0,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({word_x},{cy})\\p1\\1c{box_color}\\alpha&H20&\\blur2\\t(0,120,\\fscx105\\fscy105)\\t(120,{dur},\\fscx100\\fscy100)}}{box_shape}{{\\p0}}")
+                        
+                        # Active Text
+                        lines.append(f"Dialogue: 1,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({word_x},{cy})\\1c{active_color}\\b1\\fscx{active_scale}\\fscy{active_scale}\\t(0,120,\\fscx{active_scale+10}\\fscy{active_scale+10})\\t(120,{dur},\\fscx{active_scale}\\fscy{active_scale})}}{w['text']}")
+                    else:
+                        # Passive Text
+                        lines.append(f"Dialogue: 1,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({word_x},{cy})\\1c{passive_color}\\alpha&H60&\\fscx{passive_scale}\\fscy{passive_scale}}}{w['text']}")
+                    
+                    current_x += word_width + spacing
+            return lines
+
+        return r.window_loop(window, fragment, compose, context=1)
@@ -0,0 +1,31 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+from render_engine import ACTIVE
+
+
+# --- TikTok Group (2-3 words, active highlighted) ---
+class TiktokGroup(Effect):
+    def render(self, r) -> str:
+        """Shows 2-3 words at once with active word highlighted"""
+        cx, cy = r.anchor()
+        n = len(r.words)
+
+        def window(i):
+            # Previous + CURRENT + next
+            return max(0, i - 1), min(n, i + 2)
+
+        def fragment(j, state):
+            text = r.words[j]['text']
+            if state == ACTIVE:
+                return f"{{\\alpha&H00&\\fscx120\\fscy120\\1c&HFFFF00&\\blur3}}{text}"
+            # Neighbours are dimmed
+            return f"{{\\alpha&H80&\\fscx90\\fscy90}}{text}"
+
+        def compose(i, lo, parts):
+            word = r.words[i]
+            start_ms = int(word['start'] * 1000)
+            end_ms = int(word['end'] * 1000)
+            full_text = " ".join(parts)
+            return [f"Dialogue: 1,{ms_to_ass(start_ms)},{ms_to_ass(end_ms)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fad(100,100)}}{full_text}"]
+
+        return r.window_loop(window, fragment, compose, context=1)
@@ -0,0 +1,31 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- TikTok Yellow Box (Single Word) ---
+class TiktokYellowBox(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            res = []
+            text = word['text']
+            
+            # Calculate box dimensions from the text drawn at \fscx110
+            char_width = 35  # Approximate width per character if the font can't be measured
+            text_width = r.text_width(text, 110, char_width)
+            box_w = text_width + 60  # Add padding
+            box_h = 90
+            
+            # Create rounded rectangle shape (approximation with bezier curves)
+            radius = 15
+            box_shape = f"m {radius} 0 l {box_w-radius} 0 b {box_w} 0 {box_w} {radius} {box_w} {radius} l {box_w} {box_h-radius} b {box_w} {box_h} {box_w-radius} {box_h} {box_w-radius} {box_h} l {radius} {box_h} b 0 {box_h} 0 {box_h-radius} 0 {box_h-radius} l 0 {radius} b 0 0 {radius} 0 {radius} 0"
+            
+            # Background box (yellow with slight transparency)
+            box_start = start
+            box_end = end
+            res.append(f"Dialogue: 0,{ms_to_ass(box_start)},{ms_to_ass(box_end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\p1\\1c&H00FFFF&\\alpha&H20&\\blur2\\fscx100\\fscy100\\t(0,150,\\fscx105\\fscy105)\\t(150,{dur},\\fscx100\\fscy100)}}{box_shape}{{\\p0}}")
+            
+            # Text (black, bold)
+            res.append(f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\1c&H000000&\\b1\\fscx110\\fscy110\\t(0,150,\\fscx120\\fscy120)\\t(150,{dur},\\fscx110\\fscy110)}}{text}")
+            
+            return res
+        return r.base_loop(effect)
@@ -0,0 +1,12 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Typewriter Pro ---
+class TypewriterPro(Effect):
+    def render(self, r) -> str:
+        # This is tricky in word-based, but we can simulate by just appearing abruptly
+        # or using \clip to reveal. Let's use a simple pop-in per word for now as "word-writer"
+        def effect(word, start, end, dur, cx, cy):
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\frz90\\t(0,100,\\frz0)}}{word['text']}"]
+        return r.base_loop(effect)
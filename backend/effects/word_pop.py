@@ -0,0 +1,11 @@
+from ass_format import ms_to_ass
+from effects.base import Effect
+
+
+# --- Word Pop (Default/Clean) ---
+class WordPop(Effect):
+    def render(self, r) -> str:
+        def effect(word, start, end, dur, cx, cy):
+            # Simple clean pop
+            return [f"Dialogue: 1,{ms_to_ass(start)},{ms_to_ass(end)},Default,,0,0,0,,{{\\an5\\pos({cx},{cy})\\fscx80\\fscy80\\t(0,80,\\fscx110\\fscy110)\\t(80,150,\\fscx100\\fscy100)}}{word['text']}"]
+        return r.base_loop(effect)
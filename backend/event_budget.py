@@ -0,0 +1,61 @@
+import os
+from bisect import bisect_right, insort
+from typing import List
+
+from ass_format import ass_to_cs
+
+# -----------------------------------------------------------------------------
+# Event budget / level of detail for particle presets
+# -----------------------------------------------------------------------------
+# libass cost grows with the number of events on screen at once, so heavy
+# presets can stall playback and burns. Effects declare their scalable particle
+# layers by putting "lod<N>" in the Dialogue Name field (libass ignores it):
+# lod1 is thinned first, then lod2, then lod3. Untagged events (the words
+# themselves, boxes, glows) are always kept. Blocks are swept in time order and
+# a particle is dropped when ASS_EVENT_BUDGET events would already be showing
+# at its start time, so what is left of the budget goes to the higher-priority layers.
+EVENT_BUDGET = int(os.getenv("ASS_EVENT_BUDGET", "400"))
+
+
+class EventBudget:
+    """Thins lod-tagged events block by block so at most `budget` overlap (0 = unlimited)."""
+
+    def __init__(self, budget: int = EVENT_BUDGET):
+        self.budget = budget
+        self.culled = 0
+        self._ends: List[int] = []  # sorted end times of kept events that may still be showing
+
+    def apply(self, lines: List[str]) -> List[str]:
+        if self.budget <= 0 or not lines:
+            return lines
+        parsed = []
+        for line in lines:
+            _, start, end, _, name, _ = line.split(",", 5)
+            parsed.append((int(name[3:]) if name.startswith("lod") else 0, ass_to_cs(start), ass_to_cs(end)))
+        ends = self._ends
+        # Blocks arrive in time order: nothing that ended before this one starts can overlap it.
+        del ends[:bisect_right(ends, min(start for _, start, _ in parsed))]
+        if len(ends) + len(parsed) <= self.budget:
+            # Fits even if everything overlaps: keep the whole block.
+            ends.extend(end for _, _, end in parsed)
+            ends.sort()
+            return lines
+        scalable = []
+        for i, (lod, start, end) in enumerate(parsed):
+            if lod:
+                scalable.append((-lod, i))
+            else:
+                insort(ends, end)
+        # Highest priority first; within a layer, earlier lines first.
+        scalable.sort()
+        dropped = set()
+        for _, i in scalable:
+            _, start, end = parsed[i]
+            if len(ends) - bisect_right(ends, start) < self.budget:
+                insort(ends, end)
+            else:
+                dropped.add(i)
+        if not dropped:
+            return lines
+        self.culled += len(dropped)
+        return [line for i, line in enumerate(lines) if i not in dropped]
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# -----------------------------------------------------------------------------
+# Export cache and storage quota
+# -----------------------------------------------------------------------------
+# A burn is keyed on everything that changes the MP4: the source media hash, the
+# words and merged style (as canonical JSON), the resolution and the encoder
+# settings. Identical exports are served from the existing file instead of being
+# burned again, and artefacts are named after the key so each is stored once.
+#
+# Exports, their .ass files, uploaded media, proxies and the PCM cache share
+# STORAGE_QUOTA_MB of disk (0 = unlimited). Once it is exceeded, the least
+# recently used files are deleted, except media of queued or running jobs, which
+# is pinned, and job results (exports, transcripts) that have not been
+# downloaded yet, which are held for up to RESULT_HOLD_S. Files being written
+# start with "." and are not counted until they are renamed into place.
+DEFAULT_QUOTA_MB = 10240
+RESULT_HOLD_S = float(os.getenv("EXPORT_RESULT_HOLD_S", "3600"))
+# Bump when rendering changes, so older exports are not served for new requests.
+EXPORT_CACHE_VERSION = 1
+
+
+def _canonical_json(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def export_key(media_hash: str, words: list, style: dict, resolution: str, encoder: Iterable) -> str:
+    params = [
+        EXPORT_CACHE_VERSION,
+        media_hash,
+        hashlib.sha256(_canonical_json(words).encode("utf-8")).hexdigest(),
+        hashlib.sha256(_canonical_json(style).encode("utf-8")).hexdigest(),
+        resolution,
+        [str(arg) for arg in encoder],
+    ]
+    return hashlib.sha256(json.dumps(params).encode("utf-8")).hexdigest()
+
+
+class ExportCache:
+    """
+    Index of finished exports plus LRU enforcement of the storage quota over
+    the export directory (export_*.mp4, subtitles_*.ass, transcript_*.json),
+    the media directory, the proxy directory and the PCM cache (pcm/*.npy).
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        output_dir: Path,
+        media_dir: Path,
+        quota_bytes: Optional[int] = None,
+        proxy_dir: Optional[Path] = None,
+        pcm_dir: Optional[Path] = None,
+    ):
+        if quota_bytes is None:
+            quota_bytes = int(float(os.getenv("STORAGE_QUOTA_MB", DEFAULT_QUOTA_MB)) * 1024 * 1024)
+        self.quota_bytes = quota_bytes
+        self.output_dir = output_dir
+        self.media_dir = media_dir
+        self.proxy_dir = proxy_dir
+        self.pcm_dir = pcm_dir
+        self.hits = 0
+        self.misses = 0
+        self.evicted_files = 0
+        self._lock = threading.Lock()
+        self._pinned = Counter()
+        self._held: Dict[str, float] = {}  # path -> hold deadline
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS exports (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                ass_path TEXT,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    # --- export index ------------------------------------------------------
+    def get(self, key: str) -> Optional[Path]:
+        """Path of a finished export, or None (also when its file was deleted)."""
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM exports WHERE key = ?", (key,)).fetchone()
+            if row is not None and not Path(row[0]).exists():
+                self._conn.execute("DELETE FROM exports WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE exports SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return Path(row[0])
+
+    def put(self, key: str, path: Path, ass_path: Optional[Path] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO exports (key, path, ass_path, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, str(path), str(ass_path) if ass_path else None, path.stat().st_size, time.time()),
+            )
+            self._conn.commit()
+
+    # --- storage quota -----------------------------------------------------
+    def pin(self, *paths: Path):
+        """Protects paths from eviction (until unpin) while a job needs them."""
+        with self._lock:
+            self._pinned.update(str(path) for path in paths)
+
+    def unpin(self, *paths: Path):
+        with self._lock:
+            self._pinned.subtract(str(path) for path in paths)
+            self._pinned += Counter()  # drop zero counts
+
+    def hold(self, path: Path, seconds: float = RESULT_HOLD_S):
+        """Protects a job result from eviction until release() (its download) or for `seconds`."""
+        with self._lock:
+            self._held[str(path)] = time.time() + seconds
+
+    def release(self, path: Path):
+        with self._lock:
+            self._held.pop(str(path), None)
+
+    def _protected(self, path: Path, now: float) -> bool:
+        key = str(path)
+        if self._pinned[key]:
+            return True
+        deadline = self._held.get(key)
+        if deadline is None:
+            return False
+        if deadline > now:
+            return True
+        del self._held[key]
+        return False
+
+    def _candidates(self) -> List[Tuple[float, int, Path]]:
+        """(last used, size, path) of every file the quota covers."""
+        last_used = {}
+        for path, ass_path, used in self._conn.execute("SELECT path, ass_path, last_used FROM exports"):
+            last_used[path] = used
+            if ass_path:
+                last_used[ass_path] = used
+        files = []
+        patterns = [
+            (self.output_dir, "export_*.mp4"),
+            (self.output_dir, "subtitles_*.ass"),
+            (self.output_dir, "transcript_*.json"),
+            (self.media_dir, "*"),
+        ]
+        if self.proxy_dir is not None:
+            patterns.append((self.proxy_dir, "*.mp4"))
+        if self.pcm_dir is not None and self.pcm_dir.is_dir():
+            patterns.append((self.pcm_dir, "*.npy"))
+        for directory, pattern in patterns:
+            for path in directory.glob(pattern):
+                if path.name.startswith(".") or not path.is_file():
+                    continue  # uploads still being written
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                files.append((last_used.get(str(path), stat.st_mtime), stat.st_size, path))
+        return files
+
+    def enforce_quota(self) -> int:
+        """Deletes least-recently-used files until the quota holds; returns bytes freed."""
+        if self.quota_bytes <= 0:
+            return 0
+        freed = 0
+        with self._lock:
+            files = self._candidates()
+            total = sum(size for _, size, _ in files)
+            if total <= self.quota_bytes:
+                return 0
+            now = time.time()
+            for _, size, path in sorted(files, key=lambda item: item[0]):
+                if total <= self.quota_bytes:
+                    break
+                if self._protected(path, now):
+                    continue
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                freed += size
+                self.evicted_files += 1
+                self._conn.execute("DELETE FROM exports WHERE path = ?", (str(path),))
+            self._conn.commit()
+        if freed:
+            print(f"[storage] Evicted {freed / (1024 * 1024):.1f} MB to stay under the {self.quota_bytes // (1024 * 1024)} MB quota")
+        return freed
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM exports").fetchone()
+            used = sum(size for _, size, _ in self._candidates())
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+            "storage_bytes": used,
+            "quota_bytes": self.quota_bytes,
+            "evicted_files": self.evicted_files,
+        }
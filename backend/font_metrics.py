@@ -0,0 +1,169 @@
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:  # optional: layouts fall back to per-character estimates
+    TTFont = None
+
+# -----------------------------------------------------------------------------
+# Font metrics for box/group layouts
+# -----------------------------------------------------------------------------
+# Measures text the way libass lays it out: glyph advances plus pair kerning
+# (kern table and GPOS "kern" pair adjustments), scaled so that the font's
+# win ascent + descent equals the ASS Fontsize. Fonts are looked up by family
+# name in backend/fonts. Advances are memoized per (font, glyph) and widths per
+# (font, size, scale, text), so repeated words cost a dict lookup.
+FONTS_DIR = Path(__file__).resolve().parent / "fonts"
+
+
+class FontMetrics:
+    def __init__(self, path: Path):
+        font = TTFont(str(path), lazy=True)
+        self.cmap = font.getBestCmap() or {}
+        self.advances = {name: adv for name, (adv, _) in font["hmtx"].metrics.items()}
+        os2 = font["OS/2"] if "OS/2" in font else None
+        height = (os2.usWinAscent + os2.usWinDescent) if os2 is not None else 0
+        if not height:
+            hhea = font["hhea"]
+            height = hhea.ascent - hhea.descent
+        self.height_units = height or font["head"].unitsPerEm
+        self.kern_pairs: Dict[Tuple[str, str], int] = {}
+        if "kern" in font:
+            for table in font["kern"].kernTables:
+                if getattr(table, "format", None) == 0:
+                    self.kern_pairs.update(table.kernTable)
+        self._pair_lookups = _gpos_kern_subtables(font) if "GPOS" in font else []
+        self._kern_cache: Dict[Tuple[str, str], int] = {}
+        self.missing = self.cmap.get(0xFFFD) or ".notdef"
+
+    def glyph(self, char: str) -> str:
+        return self.cmap.get(ord(char), self.missing)
+
+    def kerning(self, left: str, right: str) -> int:
+        pair = (left, right)
+        value = self._kern_cache.get(pair)
+        if value is None:
+            value = self.kern_pairs.get(pair, 0)
+            for subtable in self._pair_lookups:
+                adjust = _pair_adjustment(subtable, left, right)
+                if adjust is not None:
+                    value = adjust
+                    break
+            self._kern_cache[pair] = value
+        return value
+
+    def advance_units(self, text: str) -> int:
+        total = 0
+        prev = None
+        for char in text:
+            name = self.glyph(char)
+            total += self.advances.get(name, 0)
+            if prev is not None:
+                total += self.kerning(prev, name)
+            prev = name
+        return total
+
+
+def _gpos_kern_subtables(font) -> list:
+    """PairPos subtables reachable from the GPOS 'kern' feature, in lookup order."""
+    gpos = font["GPOS"].table
+    if not gpos.FeatureList or not gpos.LookupList:
+        return []
+    indices = sorted({
+        index
+        for record in gpos.FeatureList.FeatureRecord
+        if record.FeatureTag == "kern"
+        for index in record.Feature.LookupListIndex
+    })
+    subtables = []
+    for index in indices:
+        lookup = gpos.LookupList.Lookup[index]
+        for subtable in lookup.SubTable:
+            if lookup.LookupType == 9:  # extension wrapper
+                subtable = subtable.ExtSubTable
+            if getattr(subtable, "LookupType", 2) == 2 and subtable.Format in (1, 2):
+                subtable.coverage_index = {name: i for i, name in enumerate(subtable.Coverage.glyphs)}
+                subtables.append(subtable)
+    return subtables
+
+
+def _pair_adjustment(subtable, left: str, right: str) -> Optional[int]:
+    """X advance adjustment for (left, right) from one PairPos subtable, or None if it has no entry."""
+    index = subtable.coverage_index.get(left)
+    if index is None:
+        return None
+    if subtable.Format == 1:
+        for record in subtable.PairSet[index].PairValueRecord:
+            if record.SecondGlyph == right:
+                value = getattr(record, "Value1", None)
+                return getattr(value, "XAdvance", 0) or 0
+        return None
+    class1 = subtable.ClassDef1.classDefs.get(left, 0)
+    class2 = subtable.ClassDef2.classDefs.get(right, 0)
+    value = getattr(subtable.Class1Record[class1].Class2Record[class2], "Value1", None)
+    return getattr(value, "XAdvance", 0) or 0
+
+
+_fonts: Dict[str, Optional[FontMetrics]] = {}
+_font_paths: Optional[Dict[str, Path]] = None
+_lock = threading.Lock()
+
+
+def _index_fonts() -> Dict[str, Path]:
+    """Maps lower-cased family / full names and file stems to font files."""
+    paths: Dict[str, Path] = {}
+    for path in sorted(FONTS_DIR.glob("*")):
+        if path.suffix.lower() not in (".ttf", ".otf") or path.name.startswith("._"):
+            continue
+        paths.setdefault(path.stem.lower(), path)
+        try:
+            names = TTFont(str(path), lazy=True)["name"]
+        except Exception:
+            continue
+        for name_id in (1, 4, 16):
+            name = names.getDebugName(name_id)
+            if name:
+                paths.setdefault(name.lower(), path)
+    return paths
+
+
+def get_font(family: str) -> Optional[FontMetrics]:
+    """Metrics for a font family in backend/fonts, or None if unavailable."""
+    global _font_paths
+    if TTFont is None or not family:
+        return None
+    key = family.lower()
+    if key in _fonts:
+        return _fonts[key]
+    with _lock:
+        if key not in _fonts:
+            if _font_paths is None:
+                _font_paths = _index_fonts()
+            path = _font_paths.get(key)
+            metrics = None
+            if path is not None:
+                try:
+                    metrics = FontMetrics(path)
+                except Exception as e:
+                    print(f"[fonts] Could not read {path.name}: {e}")
+            _fonts[key] = metrics
+        return _fonts[key]
+
+
+@lru_cache(maxsize=65536)
+def text_width(text: str, family: str, font_size: float, scale_x: float = 100, fallback_char_width: float = 0) -> int:
+    """
+    Rendered width of text in script pixels at font_size and \\fscx scale_x.
+    Without fontTools or the font, returns the old estimate
+    len(text) * fallback_char_width (or 0.6 em per character, scaled).
+    """
+    metrics = get_font(family)
+    if metrics is None:
+        if fallback_char_width:
+            return int(len(text) * fallback_char_width)
+        return int(len(text) * font_size * 0.6 * scale_x / 100)
+    px = metrics.advance_units(text) * font_size / metrics.height_units
+    return int(round(px * scale_x / 100))
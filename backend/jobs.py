@@ -0,0 +1,236 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+# -----------------------------------------------------------------------------
+# Local job subsystem (SQLite-backed, in-process worker lanes, no Redis)
+# -----------------------------------------------------------------------------
+# Each job "kind" gets its own worker lane (thread pool) so a queue of CPU-heavy
+# burns can never starve transcription. Lane sizes come from env vars:
+#   JOB_LIMIT_BURN=1  JOB_LIMIT_TRANSCRIBE=1
+JOB_KINDS = ("transcribe", "burn")
+DEFAULT_LIMITS = {"transcribe": 1, "burn": 1}
+
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+STATE_CANCELLED = "cancelled"
+FINAL_STATES = (STATE_DONE, STATE_FAILED, STATE_CANCELLED)
+# Finished jobs are pruned at most this often (see JobManager ttl_s).
+PRUNE_INTERVAL_S = 60
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled by the user."""
+
+
+def lane_limit(kind: str) -> int:
+    raw = os.getenv(f"JOB_LIMIT_{kind.upper()}")
+    try:
+        return max(1, int(raw)) if raw else DEFAULT_LIMITS.get(kind, 1)
+    except ValueError:
+        return DEFAULT_LIMITS.get(kind, 1)
+
+
+class JobContext:
+    """Handle passed to a running job: progress reporting and cancellation."""
+
+    def __init__(self, manager: "JobManager", job_id: str):
+        self.manager = manager
+        self.job_id = job_id
+        self.cancel_event = threading.Event()
+        self._processes = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled(self.job_id)
+
+    def set_progress(self, percent: float):
+        self.manager._update(self.job_id, progress=round(max(0.0, min(100.0, percent)), 1))
+
+    def register_process(self, proc):
+        """Track a subprocess so DELETE /api/jobs/{id} can kill it."""
+        with self._lock:
+            self._processes.append(proc)
+        if self.cancelled:
+            self.kill_processes()
+
+    def unregister_process(self, proc):
+        with self._lock:
+            if proc in self._processes:
+                self._processes.remove(proc)
+
+    def kill_processes(self):
+        with self._lock:
+            procs = list(self._processes)
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+
+
+class JobManager:
+    def __init__(self, db_path: Path, ttl_s: float = 0):
+        self.db_path = db_path
+        # Finished jobs are deleted this long after they ended (0 = kept forever).
+        self.ttl_s = ttl_s
+        self._last_prune = 0.0
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                state TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                error TEXT,
+                result_path TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        # Jobs that were queued/running when the server stopped cannot resume.
+        self._conn.execute(
+            "UPDATE jobs SET state = ?, error = ?, updated_at = ? WHERE state IN (?, ?)",
+            (STATE_FAILED, "Interrupted by server restart", time.time(), STATE_QUEUED, STATE_RUNNING),
+        )
+        self._conn.commit()
+        self._prune()
+        self._executors: Dict[str, ThreadPoolExecutor] = {
+            kind: ThreadPoolExecutor(max_workers=lane_limit(kind), thread_name_prefix=f"job-{kind}")
+            for kind in JOB_KINDS
+        }
+        self._contexts: Dict[str, JobContext] = {}
+
+    # --- persistence -------------------------------------------------------
+    def _update(self, job_id: str, **fields) -> bool:
+        """
+        Updates a job that has not finished yet. Returns False (and changes
+        nothing) once it is done, failed or cancelled, so a late write can never
+        overwrite a concurrent cancel, or a cancel a finished job.
+        """
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{key} = ?" for key in fields)
+        placeholders = ", ".join("?" for _ in FINAL_STATES)
+        with self._db_lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {columns} WHERE id = ? AND state NOT IN ({placeholders})",
+                (*fields.values(), job_id, *FINAL_STATES),
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def _prune(self):
+        """Deletes jobs that finished more than ttl_s ago, at most every PRUNE_INTERVAL_S."""
+        now = time.time()
+        if self.ttl_s <= 0 or now - self._last_prune < PRUNE_INTERVAL_S:
+            return
+        self._last_prune = now
+        placeholders = ", ".join("?" for _ in FINAL_STATES)
+        with self._db_lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM jobs WHERE state IN ({placeholders}) AND updated_at < ?",
+                (*FINAL_STATES, now - self.ttl_s),
+            )
+            self._conn.commit()
+        if cursor.rowcount:
+            print(f"[jobs] Pruned {cursor.rowcount} finished jobs older than {self.ttl_s:.0f} s")
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._db_lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    # --- scheduling --------------------------------------------------------
+    def executor(self, kind: str) -> ThreadPoolExecutor:
+        return self._executors[kind]
+
+    def submit(
+        self,
+        kind: str,
+        fn: Callable[[JobContext], Optional[str]],
+        cleanup: Optional[Callable[[], None]] = None,
+    ) -> str:
+        """
+        Queue fn(ctx) on the lane for `kind` and return the job id immediately.
+        fn may return a result file path, stored on the job for download.
+        cleanup() runs once the job is over, even if it was cancelled before it started.
+        """
+        if kind not in self._executors:
+            raise ValueError(f"Unknown job kind: {kind}")
+        self._prune()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, state, progress, created_at, updated_at) VALUES (?, ?, ?, 0, ?, ?)",
+                (job_id, kind, STATE_QUEUED, now, now),
+            )
+            self._conn.commit()
+        ctx = JobContext(self, job_id)
+        self._contexts[job_id] = ctx
+        self._executors[kind].submit(self._run, ctx, fn, cleanup)
+        return job_id
+
+    def complete(self, kind: str, result_path: Optional[str] = None) -> str:
+        """Record a job that is already done (e.g. served from a cache) and return its id."""
+        self._prune()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, state, progress, result_path, created_at, updated_at) "
+                "VALUES (?, ?, ?, 100, ?, ?, ?)",
+                (job_id, kind, STATE_DONE, str(result_path) if result_path else None, now, now),
+            )
+            self._conn.commit()
+        return job_id
+
+    def _run(self, ctx: JobContext, fn: Callable[[JobContext], Optional[str]], cleanup: Optional[Callable[[], None]] = None):
+        job_id = ctx.job_id
+        try:
+            if ctx.cancelled or not self._update(job_id, state=STATE_RUNNING):
+                return  # cancelled while queued
+            result_path = fn(ctx)
+            ctx.check_cancelled()
+            self._update(
+                job_id,
+                state=STATE_DONE,
+                progress=100.0,
+                result_path=str(result_path) if result_path else None,
+            )
+        except JobCancelled:
+            self._update(job_id, state=STATE_CANCELLED)
+        except Exception as exc:
+            if ctx.cancelled:
+                self._update(job_id, state=STATE_CANCELLED)
+            else:
+                print(f"Job {job_id} failed: {exc}")
+                self._update(job_id, state=STATE_FAILED, error=str(getattr(exc, "detail", exc)))
+        finally:
+            self._contexts.pop(job_id, None)
+            if cleanup:
+                cleanup()
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns False if it already finished."""
+        if not self._update(job_id, state=STATE_CANCELLED):
+            return False
+        ctx = self._contexts.get(job_id)
+        if ctx:
+            ctx.cancel_event.set()
+            ctx.kill_processes()
+        return True
@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+# -----------------------------------------------------------------------------
+# Long-form transcription: split at silences, decode chunks in parallel
+# -----------------------------------------------------------------------------
+# Audio is cut in the middle of silent gaps found by the Silero VAD that ships
+# with faster-whisper, once a chunk reaches LONG_FORM_CHUNK_S seconds. Chunks
+# are transcribed concurrently; real parallelism is bounded by the model pool
+# (WHISPER_NUM_WORKERS / WHISPER_MAX_INFLIGHT, which default to the core count
+# on CPU).
+SAMPLE_RATE = 16000
+CHUNK_S = float(os.getenv("LONG_FORM_CHUNK_S", "60"))
+# Extra audio on each side of a chunk so words at the edges have context.
+# Words whose midpoint falls in the padding belong to the neighbouring chunk.
+PAD_S = 0.3
+LONG_FORM_WORKERS = int(os.getenv("LONG_FORM_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+_executor = ThreadPoolExecutor(max_workers=LONG_FORM_WORKERS, thread_name_prefix="long-form")
+
+
+def plan_chunks(audio, chunk_s: float = CHUNK_S) -> List[Tuple[int, int]]:
+    """
+    Returns (start, end) sample ranges covering the audio, cut in silent gaps.
+    """
+    total = len(audio)
+    target = int(chunk_s * SAMPLE_RATE)
+    if total <= target:
+        return [(0, total)]
+    speech = get_speech_timestamps(
+        audio,
+        VadOptions(min_silence_duration_ms=300, speech_pad_ms=100, max_speech_duration_s=chunk_s),
+    )
+    cuts = [0]
+    for prev, nxt in zip(speech, speech[1:]):
+        # Cut in the gap before the first speech run that would overflow the chunk.
+        if nxt["end"] - cuts[-1] > target:
+            cuts.append((prev["end"] + nxt["start"]) // 2)
+    cuts.append(total)
+    chunks = []
+    for start, end in zip(cuts, cuts[1:]):
+        # No usable silence (music, non-stop speech): fall back to fixed-size cuts.
+        while end - start > target * 3 // 2:
+            chunks.append((start, start + target))
+            start += target
+        if end > start:
+            chunks.append((start, end))
+    return chunks
+
+
+def transcribe_long_form(
+    acquire_model: Callable,
+    model_name: str,
+    audio,
+    language: Optional[str],
+    transcribe_options: dict,
+    clean_segment_words: Callable,
+) -> Tuple[str, List[dict]]:
+    """
+    Transcribes 16 kHz mono audio chunk by chunk in parallel and merges the
+    words with absolute timestamps. Returns (language, words).
+    """
+    chunks = plan_chunks(audio)
+    pad = int(PAD_S * SAMPLE_RATE)
+
+    def run_chunk(chunk: Tuple[int, int], chunk_language: Optional[str]) -> Tuple[str, List[dict]]:
+        core_start, core_end = chunk
+        start = max(0, core_start - pad)
+        end = min(len(audio), core_end + pad)
+        offset = start / SAMPLE_RATE
+        with acquire_model(model_name) as model:
+            segments, info = model.transcribe(audio[start:end], language=chunk_language, **transcribe_options)
+            words = []
+            for seg in segments:
+                for w in clean_segment_words(seg):
+                    w_start = round(w["start"] + offset, 3)
+                    w_end = round(w["end"] + offset, 3)
+                    midpoint = (w_start + w_end) / 2 * SAMPLE_RATE
+                    # De-duplicate the overlap: each word belongs to the chunk whose core holds it.
+                    if core_start <= midpoint < core_end:
+                        words.append({**w, "start": w_start, "end": w_end})
+        return info.language, words
+
+    # The first chunk fixes the language so every chunk decodes consistently.
+    language, words = run_chunk(chunks[0], language)
+    results = _executor.map(lambda chunk: run_chunk(chunk, language)[1], chunks[1:])
+    for chunk_words in results:
+        words.extend(chunk_words)
+    return language, words
@@ -1,38 +1,70 @@
+import asyncio
 import json
 import os
 import re
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 
-from fastapi import FastAPI, File, Form, UploadFile, BackgroundTasks, HTTPException, Response, Request
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Response, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
-from faster_whisper import WhisperModel
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 import uvicorn
 
-def ms_to_ass_timestamp(ms: int) -> str:
-    """Converts milliseconds to ASS timestamp format H:MM:SS.cc"""
-    s = ms / 1000.0
-    h = int(s // 3600)
-    m = int((s % 3600) // 60)
-    sec = int(s % 60)
-    cs = int((s - int(s)) * 100)
-    return f"{h}:{m:02d}:{sec:02d}.{cs:02d}"
+from ass_format import build_script, ms_to_ass
+from ass_optimizer import ASS_OPTIMIZE
+from audio import load_pcm
+from event_budget import EVENT_BUDGET
+from export_cache import RESULT_HOLD_S, ExportCache, export_key
+from jobs import JobContext, JobManager
+from long_form import transcribe_long_form
+from media_store import find_media, spool_upload
+from model_pool import ModelPool
+from parallel_burn import BURN_MIN_SEGMENT_S, BURN_SEGMENTS, burn_segments, plan_segments, probe_cut_points
+from preview_video import (
+    PREVIEW_HEIGHT,
+    PREVIEW_LOOKBACK_S,
+    PREVIEW_MAX_WINDOW_S,
+    PREVIEW_SLOTS,
+    iter_preview,
+    preview_closer,
+    preview_command,
+    start_preview,
+    write_window_script,
+)
+from proxy import STATE_PENDING, STATE_READY, ProxyBuilder, find_proxy
+from transcription_cache import TranscriptionCache, transcription_key
+
 
 # -----------------------------------------------------------------------------
-# Whisper model bootstrap (cached globally to avoid repeated loads)
+# Whisper model bootstrap (pooled globally to avoid repeated loads)
 # -----------------------------------------------------------------------------
 DEFAULT_MODEL = os.getenv("WHISPER_MODEL", "medium")
 DEVICE = "cuda" if shutil.which("nvidia-smi") else "cpu"
-MODEL_CACHE: dict[str, WhisperModel] = {}
+MODEL_POOL = ModelPool(DEVICE, compute_type="float16" if DEVICE == "cuda" else "int8")
 OUTPUT_DIR = Path(__file__).resolve().parent / "exports"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 FONTS_DIR = Path(__file__).resolve().parent / "fonts"
 FONTS_DIR.mkdir(parents=True, exist_ok=True)
+MEDIA_DIR = OUTPUT_DIR / "media"
+MEDIA_DIR.mkdir(parents=True, exist_ok=True)
+PCM_DIR = OUTPUT_DIR / "pcm"
+PROXY_DIR = OUTPUT_DIR / "proxies"
+PROXY_DIR.mkdir(parents=True, exist_ok=True)
+# Finished jobs are forgotten once their result is no longer held for download.
+JOB_MANAGER = JobManager(OUTPUT_DIR / "jobs.sqlite3", ttl_s=RESULT_HOLD_S)
+TRANSCRIPTION_CACHE = TranscriptionCache(OUTPUT_DIR / "transcriptions.sqlite3")
+EXPORT_CACHE = ExportCache(
+    OUTPUT_DIR / "exports.sqlite3", OUTPUT_DIR, MEDIA_DIR, proxy_dir=PROXY_DIR, pcm_dir=PCM_DIR
+)
+PROXIES = ProxyBuilder(PROXY_DIR, storage=EXPORT_CACHE)
 
 PRESET_STYLE_MAP = {
     "fire-storm": {
@@ -549,28 +581,9 @@ PRESET_STYLE_MAP = {
 }
 
 
-def get_model(model_name: str) -> WhisperModel:
-    if model_name not in MODEL_CACHE:
-        MODEL_CACHE[model_name] = WhisperModel(
-            model_name,
-            device=DEVICE,
-            compute_type="float16" if DEVICE == "cuda" else "int8",
-        )
-    return MODEL_CACHE[model_name]
-
-
 # -----------------------------------------------------------------------------
 # Helpers
 # -----------------------------------------------------------------------------
-def ms_to_ass_timestamp(ms: float) -> str:
-    total_ms = int(ms)
-    hours = total_ms // 3_600_000
-    minutes = (total_ms % 3_600_000) // 60_000
-    seconds = (total_ms % 60_000) // 1_000
-    centiseconds = (total_ms % 1_000) // 10
-    return f"{hours:d}:{minutes:02d}:{seconds:02d}.{centiseconds:02d}"
-
-
 def css_hex_to_ass(value: str) -> str:
     """
     Convert CSS hex (#RRGGBB or #AARRGGBB) to ASS (&HAABBGGRR).
@@ -634,14 +647,14 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         start_ms = int(word["start"] * 1000)
         end_ms = int(word["end"] * 1000)
         duration_cs = max(1, (end_ms - start_ms) // 10)
-        start_ts = ms_to_ass_timestamp(start_ms)
-        end_ts = ms_to_ass_timestamp(end_ms)
+        start_ts = ms_to_ass(start_ms)
+        end_ts = ms_to_ass(end_ms)
         safe_text = word["text"].replace("{", r"\{").replace("}", r"\}")
         
         # Add animation tags to active word
         text = f"{{\\k{duration_cs}{anim_tags}}}{safe_text}"
         lines.append(f"Dialogue: 0,{start_ts},{end_ts},Styled,,0,0,0,,{text}")
-    return header + "\n".join(lines)
+    return build_script(header, [lines])
 
 
 def get_animation_tags(style_id: str) -> str:
@@ -667,7 +680,54 @@ def get_animation_tags(style_id: str) -> str:
     return animations.get(style_id, "")
 
 
-def run_ffmpeg_burn(video_path: Path, ass_path: Path, output_path: Path, resolution: str):
+def probe_duration(media_path: Path) -> Optional[float]:
+    """Returns the container duration in seconds, or None if ffprobe can't tell."""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        str(media_path),
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        return float(result.stdout.strip())
+    except (OSError, ValueError):
+        return None
+
+
+# Video encoder options of every burn (part of the export cache key).
+EXPORT_ENCODER = ["-c:v", "libx264", "-preset", "veryfast", "-crf", "18"]
+
+
+def _plan_burn_segments(video_path: Path) -> List[Tuple[float, float]]:
+    """Keyframe-aligned, frame-exact ranges for a parallel burn; a single range means burn in one process."""
+    if BURN_SEGMENTS <= 1:
+        return [(0.0, 0.0)]
+    duration = probe_duration(video_path)
+    if not duration or duration < 2 * BURN_MIN_SEGMENT_S:
+        return [(0.0, duration or 0.0)]
+    try:
+        cut_points = probe_cut_points(video_path)
+    except OSError:
+        cut_points = []
+    return plan_segments(duration, cut_points)
+
+
+def run_ffmpeg_burn(
+    video_path: Path,
+    ass_path: Path,
+    output_path: Path,
+    resolution: str,
+    job: Optional[JobContext] = None,
+):
+    """
+    Burns ass_path into video_path. When a job context is given, percent done is
+    parsed from ffmpeg's -progress output and the process can be killed on cancel.
+    """
     scale_filter = {
         "original": "scale=iw:ih",
         "1080p": "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(1920-iw)/2:(1080-ih)/2",
@@ -678,6 +738,25 @@ def run_ffmpeg_burn(video_path: Path, ass_path: Path, output_path: Path, resolut
     ass_path_str = ass_path.as_posix().replace(":", r"\:")
     fonts_dir_str = FONTS_DIR.as_posix().replace(":", r"\:")
     vf = f"ass=filename='{ass_path_str}':fontsdir='{fonts_dir_str}',{scale_filter}"
+    encode_args = EXPORT_ENCODER
+
+    segments = _plan_burn_segments(video_path)
+    if len(segments) > 1:
+        try:
+            burn_segments(
+                video_path,
+                output_path,
+                segments,
+                # Shift each range back onto the original timeline for libass, then restart at 0.
+                lambda start: f"setpts=PTS+{start:.6f}/TB,{vf},setpts=PTS-STARTPTS",
+                encode_args,
+                job=job,
+                total_s=segments[-1][1],
+            )
+        except RuntimeError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        return
+
     cmd = [
         "ffmpeg",
         "-y",
@@ -685,22 +764,39 @@ def run_ffmpeg_burn(video_path: Path, ass_path: Path, output_path: Path, resolut
         str(video_path),
         "-vf",
         vf,
-        "-c:v",
-        "libx264",
-        "-preset",
-        "veryfast",
-        "-crf",
-        "18",
+        *encode_args,
         "-c:a",
         "copy",
+        "-progress",
+        "pipe:1",
+        "-nostats",
         str(output_path),
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise HTTPException(
-            status_code=500,
-            detail=f"FFmpeg failed: {result.stderr}",
-        )
+    total_s = probe_duration(video_path) if job else None
+
+    # stderr goes to a temp file so a chatty ffmpeg can't deadlock on a full pipe.
+    with tempfile.TemporaryFile(mode="w+") as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+        if job:
+            job.register_process(proc)
+        try:
+            for line in proc.stdout:
+                key, _, value = line.strip().partition("=")
+                # out_time_ms is (despite the name) microseconds, same as out_time_us.
+                if job and total_s and key in ("out_time_us", "out_time_ms") and value.isdigit():
+                    job.set_progress(int(value) / 1_000_000 / total_s * 100)
+            proc.wait()
+        finally:
+            if job:
+                job.unregister_process(proc)
+        if job:
+            job.check_cancelled()
+        if proc.returncode != 0:
+            stderr_file.seek(0)
+            raise HTTPException(
+                status_code=500,
+                detail=f"FFmpeg failed: {stderr_file.read()}",
+            )
 
 
 # -----------------------------------------------------------------------------
@@ -713,73 +809,511 @@ app.add_middleware(
     allow_methods=["*"],
     allow_credentials=True,
     allow_headers=["*"],
+    expose_headers=["X-Culled-Events", "X-Preview-Source"],
 )
 
 
+def clean_segment_words(seg) -> List[dict]:
+    """Word dicts for one faster-whisper segment, punctuation stripped."""
+    words = []
+    for w in seg.words:
+        # Remove punctuation from word text
+        clean_text = w.word.strip()
+        # Remove common punctuation marks
+        clean_text = clean_text.strip('.,!?;:"\'-()[]{}')
+        
+        # Skip if text becomes empty after cleaning
+        if not clean_text:
+            continue
+            
+        words.append(
+            {
+                "start": round(w.start, 3),
+                "end": round(w.end, 3),
+                "text": clean_text,
+                "confidence": round(getattr(w, "probability", 0) or 0, 3),
+            }
+        )
+    return words
+
+
+def start_transcription(model, audio, language, use_vad, beam_size, best_of, temperature):
+    """Returns faster-whisper's lazy (segments, info) for 16 kHz mono float32 audio."""
+    return model.transcribe(
+        audio,
+        language=language if language else None,
+        word_timestamps=True,
+        vad_filter=use_vad,
+        vad_parameters={"min_silence_duration_ms": 200} if use_vad else None,
+        beam_size=beam_size,
+        best_of=best_of,
+        temperature=temperature,
+    )
+
+
+def transcribe_media(
+    media_path: Path,
+    media_hash: str,
+    model_name: str,
+    language: Optional[str],
+    use_vad: bool,
+    beam_size: int,
+    best_of: int,
+    temperature: float,
+    long_form: bool = False,
+    audio=None,
+) -> dict:
+    """
+    Runs faster-whisper over media_path and returns the /api/transcribe payload.
+    Results are cached by media hash + Whisper parameters.
+    long_form splits the audio at silences and decodes the chunks in parallel.
+    audio may hold media_path already decoded to 16 kHz mono float32; otherwise
+    only the audio stream is extracted (and cached per media hash).
+    """
+    cache_key = transcription_key(
+        media_hash, model_name, language, use_vad, beam_size, best_of, temperature, long_form
+    )
+    cached = TRANSCRIPTION_CACHE.get(cache_key)
+    if cached is not None:
+        return {**cached, "device": DEVICE, "model": model_name, "cached": True}
+
+    started = time.perf_counter()
+    if audio is None:
+        audio = load_pcm(media_path, media_hash, PCM_DIR)
+    if long_form:
+        detected_language, words = transcribe_long_form(
+            MODEL_POOL.acquire,
+            model_name,
+            audio,
+            language if language else None,
+            {
+                "word_timestamps": True,
+                "vad_filter": use_vad,
+                "vad_parameters": {"min_silence_duration_ms": 200} if use_vad else None,
+                "beam_size": beam_size,
+                "best_of": best_of,
+                "temperature": temperature,
+            },
+            clean_segment_words,
+        )
+    else:
+        words = []
+        with MODEL_POOL.acquire(model_name) as model:
+            segments, info = start_transcription(
+                model, audio, language, use_vad, beam_size, best_of, temperature
+            )
+            # Segments decode lazily, so iterate while the model slot is held.
+            for seg in segments:
+                words.extend(clean_segment_words(seg))
+        detected_language = info.language
+    TRANSCRIPTION_CACHE.put(
+        cache_key,
+        {"language": detected_language, "words": words},
+        elapsed=time.perf_counter() - started,
+    )
+    return {"language": detected_language, "device": DEVICE, "model": model_name, "words": words, "cached": False}
+
+
+# Inference runs on the "transcribe" job lane (a thread pool: CTranslate2 releases
+# the GIL), never on the event loop. Requests beyond TRANSCRIBE_MAX_PENDING waiting
+# or running get a 503 instead of piling up.
+TRANSCRIBE_MAX_PENDING = int(os.getenv("TRANSCRIBE_MAX_PENDING", "8"))
+TRANSCRIBE_SLOTS = threading.BoundedSemaphore(max(1, TRANSCRIBE_MAX_PENDING))
+
+
+def acquire_transcribe_slot():
+    """Takes one of the TRANSCRIBE_MAX_PENDING slots (503 if none is free); release TRANSCRIBE_SLOTS when done."""
+    if not TRANSCRIBE_SLOTS.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many transcriptions in progress, retry shortly",
+            headers={"Retry-After": "10"},
+        )
+
+
+async def run_transcription(*args, cleanup: Optional[Callable[[], None]] = None) -> dict:
+    """
+    Runs transcribe_media(*args) on the transcribe lane with backpressure. The
+    slot is released, and cleanup() run, when transcribe_media returns rather
+    than when the request does: a client that goes away does not stop it.
+    """
+    def finished():
+        TRANSCRIBE_SLOTS.release()
+        if cleanup:
+            cleanup()
+
+    try:
+        acquire_transcribe_slot()
+    except HTTPException:
+        if cleanup:
+            cleanup()
+        raise
+    try:
+        future = JOB_MANAGER.executor("transcribe").submit(transcribe_media, *args)
+    except BaseException:
+        finished()
+        raise
+    future.add_done_callback(lambda f: finished())
+    return await asyncio.wrap_future(future)
+
+
+@app.on_event("startup")
+def preload_default_model():
+    """Optionally warm DEFAULT_MODEL in the background (WHISPER_PRELOAD=1)."""
+    if os.getenv("WHISPER_PRELOAD", "0") == "1":
+        threading.Thread(target=MODEL_POOL.preload, args=(DEFAULT_MODEL,), daemon=True).start()
+
+
+@app.get("/api/models")
+async def model_stats():
+    """
+    Loaded Whisper models, memory budget and in-flight inference counts.
+    """
+    return JSONResponse(MODEL_POOL.stats())
+
+
+async def resolve_media(file: Optional[UploadFile], media_id: Optional[str], proxy: bool = True) -> Tuple[Path, str]:
+    """
+    (path, media hash) of the request's source: an uploaded file, or a media_id
+    returned earlier by POST /api/media (or as media_hash by /api/transcribe).
+    The file is pinned against storage-quota eviction: the caller must
+    EXPORT_CACHE.unpin(path) once it no longer reads it. Queues a proxy build
+    for it if there is none, unless proxy is False (media that is never previewed).
+    """
+    if file is not None:
+        path, media_hash = await spool_upload(file, MEDIA_DIR)
+        EXPORT_CACHE.pin(path)
+        # New bytes on disk: make room (pinned files are never evicted).
+        await asyncio.get_running_loop().run_in_executor(None, EXPORT_CACHE.enforce_quota)
+    elif not media_id:
+        raise HTTPException(status_code=400, detail="Send a file or a media_id")
+    else:
+        path, media_hash = find_media(MEDIA_DIR, media_id), media_id
+        if path is None:
+            raise HTTPException(status_code=404, detail="Unknown media_id; upload it again with POST /api/media")
+        EXPORT_CACHE.pin(path)
+    if proxy:
+        PROXIES.ensure(path, media_hash)
+    return path, media_hash
+
+
+@app.post("/api/media")
+async def register_media(file: UploadFile = File(...)):
+    """
+    Stores a video/audio file once and returns its media_id (SHA-256 of the
+    bytes). Pass media_id instead of the file to /api/transcribe* and /api/export.
+    """
+    in_path, media_hash = await resolve_media(file, None)
+    EXPORT_CACHE.unpin(in_path)
+    return JSONResponse({"media_id": media_hash, "size": in_path.stat().st_size, "proxy": PROXIES.status(media_hash)})
+
+
+@app.get("/api/media/{media_id}")
+async def get_media(media_id: str):
+    """
+    Checks whether media_id is stored (404 if not), e.g. before skipping an
+    upload of a file whose SHA-256 the client computed itself.
+    """
+    path = find_media(MEDIA_DIR, media_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+    return {"media_id": media_id, "size": path.stat().st_size, "proxy": PROXIES.status(media_id)}
+
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)\Z")
+
+
+def file_range_response(path: Path, range_header: Optional[str], media_type: str):
+    """
+    FileResponse, or a 206 with one byte range when the client asks for it
+    (a <video> element seeks with range requests).
+    """
+    match = _RANGE_RE.match((range_header or "").strip())
+    if not match or match.groups() == ("", ""):
+        return FileResponse(path=path, media_type=media_type, headers={"Accept-Ranges": "bytes"})
+    size = path.stat().st_size
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(0, size - int(last)), size - 1  # suffix range: the last N bytes
+    if start > end or start >= size:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+
+    def read_range():
+        with path.open("rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    return StreamingResponse(
+        read_range(),
+        status_code=206,
+        media_type=media_type,
+        headers={
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1),
+        },
+    )
+
+
+@app.get("/api/media/{media_id}/proxy")
+async def get_media_proxy(media_id: str, request: Request):
+    """
+    Serves the media's low-res proxy (with range requests) for scrubbing in the
+    browser. 202 while it is still being built, 404 if there is none.
+    """
+    state = PROXIES.status(media_id)
+    if state == STATE_PENDING:
+        return JSONResponse({"media_id": media_id, "proxy": state}, status_code=202)
+    proxy = find_proxy(PROXY_DIR, media_id) if state == STATE_READY else None
+    if proxy is None:
+        raise HTTPException(status_code=404, detail=f"No proxy for this media ({state})")
+    return file_range_response(proxy, request.headers.get("range"), "video/mp4")
+
+
 @app.post("/api/transcribe")
 async def transcribe(
-    file: UploadFile = File(...),
+    file: Optional[UploadFile] = File(None),
+    media_id: Optional[str] = Form(None),
     model_name: str = Form(DEFAULT_MODEL),
     language: str | None = Form(None),
     use_vad: bool = Form(False),
     beam_size: int = Form(5),
     best_of: int = Form(5),
     temperature: float = Form(0.0),
+    long_form: bool = Form(False),
 ):
     """
     Accepts video/audio file and returns word-level timestamps with confidence.
+    Set long_form for long inputs: audio is split at silences and the chunks
+    are transcribed in parallel.
     """
-    model = get_model(model_name)
-    with tempfile.TemporaryDirectory() as tmpdir:
-        in_path = Path(tmpdir) / file.filename
-        with in_path.open("wb") as f:
-            f.write(await file.read())
-
-        segments, info = model.transcribe(
-            str(in_path),
-            language=language if language else None,
-            word_timestamps=True,
-            vad_filter=use_vad,
-            vad_parameters={"min_silence_duration_ms": 200} if use_vad else None,
-            beam_size=beam_size,
-            best_of=best_of,
-            temperature=temperature,
-        )
-        words = []
-        for seg in segments:
-            for w in seg.words:
-                # Remove punctuation from word text
-                clean_text = w.word.strip()
-                # Remove common punctuation marks
-                clean_text = clean_text.strip('.,!?;:"\'-()[]{}')
-                
-                # Skip if text becomes empty after cleaning
-                if not clean_text:
-                    continue
-                    
-                words.append(
-                    {
-                        "start": round(w.start, 3),
-                        "end": round(w.end, 3),
-                        "text": clean_text,
-                        "confidence": round(getattr(w, "probability", 0) or 0, 3),
-                    }
+    in_path, media_hash = await resolve_media(file, media_id)
+    result = await run_transcription(
+        in_path, media_hash, model_name, language, use_vad, beam_size, best_of, temperature, long_form,
+        cleanup=lambda: EXPORT_CACHE.unpin(in_path),
+    )
+    return JSONResponse({**result, "media_hash": media_hash})
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/transcribe/stream")
+async def transcribe_stream(
+    file: Optional[UploadFile] = File(None),
+    media_id: Optional[str] = Form(None),
+    model_name: str = Form(DEFAULT_MODEL),
+    language: str | None = Form(None),
+    use_vad: bool = Form(False),
+    beam_size: int = Form(5),
+    best_of: int = Form(5),
+    temperature: float = Form(0.0),
+):
+    """
+    Server-Sent Events version of /api/transcribe. Emits:
+    - info:  {"language", "device", "model", "media_hash"} once decoding starts
+    - words: {"words": [...]} for every decoded segment (same cleaning as /api/transcribe)
+    - done:  {"count", "cached"} when finished, or error: {"detail"} on failure
+    """
+    acquire_transcribe_slot()
+    try:
+        in_path, media_hash = await resolve_media(file, media_id)
+    except BaseException:
+        TRANSCRIBE_SLOTS.release()
+        raise
+    params = (model_name, language, use_vad, beam_size, best_of, temperature)
+    cache_key = transcription_key(media_hash, *params)
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def emit(event: str, data: dict):
+        loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+    def produce():
+        try:
+            cached = TRANSCRIPTION_CACHE.get(cache_key)
+            if cached is not None:
+                emit("info", {"language": cached["language"], "device": DEVICE, "model": model_name, "media_hash": media_hash})
+                emit("words", {"words": cached["words"]})
+                emit("done", {"count": len(cached["words"]), "cached": True})
+                return
+            started = time.perf_counter()
+            audio = load_pcm(in_path, media_hash, PCM_DIR)
+            words = []
+            with MODEL_POOL.acquire(model_name) as model:
+                segments, info = start_transcription(
+                    model, audio, language, use_vad, beam_size, best_of, temperature
                 )
-    return JSONResponse(
-        {"language": info.language, "device": DEVICE, "model": model_name, "words": words}
+                emit("info", {"language": info.language, "device": DEVICE, "model": model_name, "media_hash": media_hash})
+                for seg in segments:
+                    if stop.is_set():
+                        return  # client went away; stop decoding
+                    seg_words = clean_segment_words(seg)
+                    words.extend(seg_words)
+                    if seg_words:
+                        emit("words", {"words": seg_words})
+            TRANSCRIPTION_CACHE.put(
+                cache_key,
+                {"language": info.language, "words": words},
+                elapsed=time.perf_counter() - started,
+            )
+            emit("done", {"count": len(words), "cached": False})
+        except Exception as exc:
+            print(f"Transcribe Stream Error: {exc}")
+            emit("error", {"detail": str(exc)})
+        finally:
+            EXPORT_CACHE.unpin(in_path)
+            TRANSCRIBE_SLOTS.release()
+
+    # Submitted here rather than in event_stream, so the media and the slot are
+    # released even if the client goes away before the stream is ever iterated.
+    future = loop.run_in_executor(JOB_MANAGER.executor("transcribe"), produce)
+
+    async def event_stream():
+        try:
+            while True:
+                event, data = await queue.get()
+                yield sse_event(event, data)
+                if event in ("done", "error"):
+                    break
+        finally:
+            stop.set()
+            future.add_done_callback(lambda f: f.exception())
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(stop.set),
     )
 
 
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 4)))
+BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="batch")
+
+
+def transcribe_batch_item(item: tuple, model_name: str, params: tuple) -> dict:
+    """
+    Transcribes one (filename, path, media_hash) item of a batch on
+    BATCH_EXECUTOR. Its audio is decoded before it waits for a transcription
+    slot, so decoding overlaps other clips' inference; the slot is held only
+    while the clip is transcribed.
+    """
+    filename, in_path, media_hash = item
+    try:
+        cache_key = transcription_key(media_hash, model_name, *params)
+        audio = None  # cache hits are served inside transcribe_media
+        if not TRANSCRIPTION_CACHE.contains(cache_key):
+            audio = load_pcm(in_path, media_hash, PCM_DIR)
+        with TRANSCRIBE_SLOTS:
+            result = transcribe_media(in_path, media_hash, model_name, *params, audio=audio)
+        return {"filename": filename, "media_hash": media_hash, **result}
+    except Exception as exc:
+        print(f"Batch Transcribe Error ({filename}): {exc}")
+        return {"filename": filename, "media_hash": media_hash, "error": str(exc)}
+
+
+@app.post("/api/transcribe/batch")
+async def transcribe_batch(
+    files: List[UploadFile] = File(...),
+    model_name: str = Form(DEFAULT_MODEL),
+    language: str | None = Form(None),
+    use_vad: bool = Form(False),
+    beam_size: int = Form(5),
+    best_of: int = Form(5),
+    temperature: float = Form(0.0),
+    long_form: bool = Form(False),
+):
+    """
+    Transcribes many clips in one request and returns per-file word lists:
+    {"model", "device", "results": [{"filename", "media_hash", "language", "words", ...}]}.
+    A file that fails gets an "error" entry instead of failing the whole batch.
+    Clips run on BATCH_EXECUTOR, not the transcribe lane, and each takes one of
+    the TRANSCRIBE_MAX_PENDING slots while it is transcribed (waiting for it
+    if need be). The request gets a 503 if no slot is free when it arrives.
+    """
+    # Admission only: holding this slot while the clips queue for theirs could
+    # leave every slot with batches that cannot start.
+    acquire_transcribe_slot()
+    TRANSCRIBE_SLOTS.release()
+    items = []
+    try:
+        for file in files:
+            # Batch clips are never previewed: no proxy builds for them.
+            in_path, media_hash = await resolve_media(file, None, proxy=False)
+            items.append((file.filename, in_path, media_hash))
+    except BaseException:
+        EXPORT_CACHE.unpin(*(in_path for _, in_path, _ in items))
+        raise
+
+    params = (language, use_vad, beam_size, best_of, temperature, long_form)
+    futures = []
+    for item in items:
+        future = BATCH_EXECUTOR.submit(transcribe_batch_item, item, model_name, params)
+        # Unpinned when the clip is done, even if the client goes away first.
+        future.add_done_callback(lambda f, path=item[1]: EXPORT_CACHE.unpin(path))
+        futures.append(future)
+    results = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+    return JSONResponse({"model": model_name, "device": DEVICE, "results": list(results)})
+
+
+@app.post("/api/transcribe/jobs")
+async def queue_transcription(
+    file: Optional[UploadFile] = File(None),
+    media_id: Optional[str] = Form(None),
+    model_name: str = Form(DEFAULT_MODEL),
+    language: str | None = Form(None),
+    use_vad: bool = Form(False),
+    beam_size: int = Form(5),
+    best_of: int = Form(5),
+    temperature: float = Form(0.0),
+    long_form: bool = Form(False),
+):
+    """
+    Same as /api/transcribe but runs as a background job on the transcribe lane.
+    The JSON result is served by GET /api/jobs/{job_id}/result.
+    """
+    in_path, media_hash = await resolve_media(file, media_id)
+
+    def transcribe_job(job: JobContext) -> Path:
+        result = transcribe_media(
+            in_path, media_hash, model_name, language, use_vad, beam_size, best_of, temperature, long_form
+        )
+        out_path = OUTPUT_DIR / f"transcript_{uuid.uuid4().hex}.json"
+        out_path.write_text(json.dumps({**result, "media_hash": media_hash}), encoding="utf-8")
+        # Kept until downloaded (or EXPORT_RESULT_HOLD_S), whatever the quota says.
+        EXPORT_CACHE.hold(out_path)
+        EXPORT_CACHE.enforce_quota()
+        return out_path
+
+    job_id = JOB_MANAGER.submit("transcribe", transcribe_job, cleanup=lambda: EXPORT_CACHE.unpin(in_path))
+    return JSONResponse({"job_id": job_id, "state": "queued"}, status_code=202)
+
+
 @app.post("/api/export")
 async def export_subtitled_video(
-    background_tasks: BackgroundTasks = None,
-    video: UploadFile = File(...),
+    video: Optional[UploadFile] = File(None),
+    media_id: Optional[str] = Form(None),
     words_json: str = Form(...),
     style_json: str = Form(...),
     resolution: str = Form("1080p"),
 ):
     """
-    Burns .ass subtitles with provided style and edited words; returns processed video.
+    Queues a burn of .ass subtitles with provided style and edited words.
+    Returns a job id immediately; poll GET /api/jobs/{job_id} and download
+    the result from GET /api/jobs/{job_id}/result.
+    - video or media_id: the source file, or the id from POST /api/media
     - words_json: JSON list of dicts with start/end/text
     - style_json: JSON object with style parameters
     """
@@ -794,40 +1328,87 @@ async def export_subtitled_video(
     print(f"[DEBUG] Full style: {style}")
 
     # Persist artifacts inside backend/exports to avoid Temp cleanup races.
-    uid = uuid.uuid4().hex
-    suffix = Path(video.filename).suffix or ".mp4"
-    in_path = OUTPUT_DIR / f"upload_{uid}{suffix}"
-    with in_path.open("wb") as f:
-        f.write(await video.read())
+    # The source is content-addressed and may be shared with other requests,
+    # so it is kept after the burn (until the storage quota evicts it).
+    in_path, media_hash = await resolve_media(video, media_id)
+    key = export_key(
+        media_hash, words, style, resolution,
+        [*EXPORT_ENCODER, f"optimize={int(ASS_OPTIMIZE)}", f"event_budget={EVENT_BUDGET}"],
+    )
+    cached = EXPORT_CACHE.get(key)
+    if cached is not None:
+        print(f"[export] Cache hit {key[:12]}: {cached.name}")
+        EXPORT_CACHE.unpin(in_path)
+        EXPORT_CACHE.hold(cached)
+        job_id = JOB_MANAGER.complete("burn", cached)
+        return JSONResponse({"job_id": job_id, "state": "done", "cached": True}, status_code=202)
 
-    ass_path = OUTPUT_DIR / f"subtitles_{uid}.ass"
-    
-    # ALWAYS use AdvancedRenderer for these new presets
-    # If style_id is in our map (or basically any valid ID now), use AdvancedRenderer
-    # We can fallback to build_ass only if really needed, but AdvancedRenderer handles basic pop too.
-    from render_engine import AdvancedRenderer
-    renderer = AdvancedRenderer(words, style)
-    ass_content = renderer.render()
-        
-    ass_path.write_text(ass_content, encoding="utf-8")
+    def burn_job(job: JobContext) -> Path:
+        # Named after the cache key, so identical exports share one file. Written
+        # under a unique dot-name first: two identical jobs may run at once.
+        ass_path = OUTPUT_DIR / f"subtitles_{key}.ass"
+        out_path = OUTPUT_DIR / f"export_{key}.mp4"
+        uid = uuid.uuid4().hex
+        tmp_ass = OUTPUT_DIR / f".subtitles_{key}_{uid}.ass"
+        tmp_out = OUTPUT_DIR / f".export_{key}_{uid}.mp4"
+        try:
+            # ALWAYS use AdvancedRenderer for these new presets
+            # If style_id is in our map (or basically any valid ID now), use AdvancedRenderer
+            # We can fallback to build_ass only if really needed, but AdvancedRenderer handles basic pop too.
+            from render_engine import AdvancedRenderer
+            renderer = AdvancedRenderer(words, style)
+            # Streamed block by block, so long transcripts never exist as one string.
+            renderer.render_to_file(tmp_ass, optimize=ASS_OPTIMIZE)
+            if renderer.culled_events:
+                print(f"[export] Event budget ({renderer.event_budget}) culled {renderer.culled_events} particle events")
 
-    out_path = OUTPUT_DIR / f"export_{uid}.mp4"
-    try:
-        run_ffmpeg_burn(in_path, ass_path, out_path, resolution)
-    except Exception as exc:  # return JSON so CORS headers still attach
-        background_tasks.add_task(lambda: in_path.unlink(missing_ok=True))
-        raise HTTPException(status_code=500, detail=str(exc))
+            run_ffmpeg_burn(in_path, tmp_ass, tmp_out, resolution, job=job)
+            if not tmp_out.exists():
+                raise RuntimeError(f"Export failed: output file missing at {tmp_out}")
+            # Keep .ass and .mp4 for inspection.
+            os.replace(tmp_ass, ass_path)
+            os.replace(tmp_out, out_path)
+            EXPORT_CACHE.put(key, out_path, ass_path)
+            # Kept until downloaded (or EXPORT_RESULT_HOLD_S), whatever the quota says.
+            EXPORT_CACHE.hold(out_path)
+        finally:
+            tmp_ass.unlink(missing_ok=True)
+            tmp_out.unlink(missing_ok=True)
+        EXPORT_CACHE.enforce_quota()
+        return out_path
 
-    if not out_path.exists():
-        background_tasks.add_task(lambda: in_path.unlink(missing_ok=True))
-        raise HTTPException(
-            status_code=500,
-            detail=f"Export failed: output file missing at {out_path}",
-        )
+    job_id = JOB_MANAGER.submit("burn", burn_job, cleanup=lambda: EXPORT_CACHE.unpin(in_path))
+    return JSONResponse({"job_id": job_id, "state": "queued"}, status_code=202)
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Returns job state (queued/running/done/failed/cancelled) and percent done.
+    """
+    job = JOB_MANAGER.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job.pop("result_path", None)
+    return JSONResponse(job)
 
-    # Keep .ass and .mp4 for inspection; only remove uploaded source after response.
-    background_tasks.add_task(lambda: in_path.unlink(missing_ok=True))
 
+@app.get("/api/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    Downloads the output of a finished job (MP4 for exports, JSON for transcripts).
+    """
+    job = JOB_MANAGER.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["state"] != "done" or not job["result_path"]:
+        raise HTTPException(status_code=409, detail=f"Job is {job['state']}")
+    out_path = Path(job["result_path"])
+    if not out_path.exists():
+        raise HTTPException(status_code=410, detail="Job output no longer exists")
+    if out_path.suffix == ".json":
+        EXPORT_CACHE.release(out_path)
+        return JSONResponse(json.loads(out_path.read_text(encoding="utf-8")))
     return FileResponse(
         path=out_path,
         media_type="video/mp4",
@@ -835,7 +1416,36 @@ async def export_subtitled_video(
         headers={
             "Content-Disposition": "attachment; filename=pycaps_export.mp4"
         },
-        background=background_tasks,
+        # Downloaded: from now on the quota may evict it like any other export.
+        background=BackgroundTask(EXPORT_CACHE.release, out_path),
+    )
+
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """
+    Cancels a queued or running job; a running ffmpeg process is killed.
+    """
+    job = JOB_MANAGER.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not JOB_MANAGER.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job is already {job['state']}")
+    return {"job_id": job_id, "state": "cancelled"}
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """
+    Hit/miss counters and size of the server-side caches.
+    """
+    from render_engine import PREVIEW_BLOCK_CACHE
+    return JSONResponse(
+        {
+            "transcription": TRANSCRIPTION_CACHE.stats(),
+            "preview_blocks": PREVIEW_BLOCK_CACHE.stats(),
+            "exports": EXPORT_CACHE.stats(),
+        }
     )
 
 
@@ -857,16 +1467,157 @@ async def preview_ass(
         style = {**PRESET_STYLE_MAP.get(style_id, {}), **incoming_style}
 
         # ALWAYS use AdvancedRenderer
-        from render_engine import AdvancedRenderer
-        renderer = AdvancedRenderer(words, style)
+        from render_engine import AdvancedRenderer, PREVIEW_BLOCK_CACHE
+        renderer = AdvancedRenderer(words, style, block_cache=PREVIEW_BLOCK_CACHE)
         ass_content = renderer.render()
             
-        return Response(content=ass_content, media_type="text/plain")
+        return Response(
+            content=ass_content,
+            media_type="text/plain",
+            headers={"X-Culled-Events": str(renderer.culled_events)},
+        )
+    except Exception as e:
+        print(f"Preview Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/preview-ass/stream")
+async def preview_ass_stream(
+    words_json: str = Form(...),
+    style_json: str = Form(...),
+):
+    """
+    Same output as /api/preview-ass, streamed as it is rendered so long
+    transcripts start arriving immediately and never sit in memory whole.
+    """
+    try:
+        words = json.loads(words_json)
+        incoming_style = json.loads(style_json)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    style_id = incoming_style.get("id")
+    style = {**PRESET_STYLE_MAP.get(style_id, {}), **incoming_style}
+
+    from render_engine import AdvancedRenderer, PREVIEW_BLOCK_CACHE
+    renderer = AdvancedRenderer(words, style, block_cache=PREVIEW_BLOCK_CACHE)
+    return StreamingResponse(renderer.iter_script(), media_type="text/plain")
+
+
+@app.post("/api/preview-ass/incremental")
+async def preview_ass_incremental(
+    words_json: str = Form(...),
+    style_json: str = Form(...),
+    range_start: Optional[int] = Form(None),
+    range_end: Optional[int] = Form(None),
+):
+    """
+    Re-renders the preview through the event block cache, so only blocks whose
+    words (or neighbouring words) changed are regenerated. With range_start /
+    range_end (word indices of the edit) only the affected blocks are returned;
+    the client splices them over its copy of the same word range.
+    """
+    try:
+        words = json.loads(words_json)
+        incoming_style = json.loads(style_json)
+        style_id = incoming_style.get("id")
+        style = {**PRESET_STYLE_MAP.get(style_id, {}), **incoming_style}
+
+        from render_engine import AdvancedRenderer, PREVIEW_BLOCK_CACHE, style_hash
+        renderer = AdvancedRenderer(words, style, block_cache=PREVIEW_BLOCK_CACHE)
+        if range_start is None:
+            renderer.render()
+            blocks = renderer.blocks
+        else:
+            blocks = renderer.render_range(range_start, range_end if range_end is not None else range_start)
+
+        return JSONResponse({
+            "style_hash": style_hash(style),
+            "header": renderer.header,
+            "block_count": renderer.block_count,
+            "culled_events": renderer.culled_events,
+            "blocks": [{"first": first, "last": last, "lines": lines} for first, last, lines in blocks],
+        })
     except Exception as e:
         print(f"Preview Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/preview-video")
+async def preview_video(
+    video: Optional[UploadFile] = File(None),
+    media_id: Optional[str] = Form(None),
+    words_json: str = Form(...),
+    style_json: str = Form(...),
+    start: float = Form(0.0),
+    duration: float = Form(5.0),
+    height: int = Form(PREVIEW_HEIGHT),
+):
+    """
+    Burns the subtitles over `duration` seconds of the source from `start` at a
+    reduced height with x264 ultrafast, and streams the result as fragmented MP4.
+    Reads the media's proxy when one is cached, so only the window is decoded.
+    """
+    try:
+        words = json.loads(words_json)
+        incoming_style = json.loads(style_json)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if start < 0 or not 0 < duration <= PREVIEW_MAX_WINDOW_S:
+        raise HTTPException(status_code=400, detail=f"Need start >= 0 and 0 < duration <= {PREVIEW_MAX_WINDOW_S:g}")
+    if not 144 <= height <= 1080:
+        raise HTTPException(status_code=400, detail="height must be between 144 and 1080")
+    style_id = incoming_style.get("id")
+    style = {**PRESET_STYLE_MAP.get(style_id, {}), **incoming_style}
+
+    in_path, media_hash = await resolve_media(video, media_id)
+    proxy = find_proxy(PROXY_DIR, media_hash)
+    source = proxy or in_path
+    if not PREVIEW_SLOTS.acquire(blocking=False):
+        EXPORT_CACHE.unpin(in_path)
+        raise HTTPException(
+            status_code=503,
+            detail="Too many preview renders in progress, retry shortly",
+            headers={"Retry-After": "2"},
+        )
+    if proxy:
+        EXPORT_CACHE.pin(proxy)
+    fd, ass_name = tempfile.mkstemp(suffix=".ass", prefix="preview_", dir=OUTPUT_DIR)
+    os.close(fd)
+    ass_path = Path(ass_name)
+
+    def cleanup():
+        ass_path.unlink(missing_ok=True)
+        EXPORT_CACHE.unpin(in_path)
+        if proxy:
+            EXPORT_CACHE.unpin(proxy)
+        PREVIEW_SLOTS.release()
+
+    def start_render():
+        from render_engine import AdvancedRenderer, PREVIEW_BLOCK_CACHE
+        renderer = AdvancedRenderer(words, style, block_cache=PREVIEW_BLOCK_CACHE)
+        # Only the blocks of words around the window, not the whole transcript.
+        word_range = renderer.words_between(start - PREVIEW_LOOKBACK_S, start + duration)
+        blocks = renderer.render_words(*word_range) if word_range else []
+        write_window_script(ass_path, renderer.header, (lines for _, _, lines in blocks), start, start + duration)
+        # Even heights only: x264 needs even dimensions.
+        return start_preview(preview_command(source, ass_path, start, duration, height - height % 2))
+
+    try:
+        proc, first = await asyncio.get_running_loop().run_in_executor(None, start_render)
+    except Exception as e:
+        cleanup()
+        print(f"Preview video error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    close = preview_closer(proc, cleanup)
+    return StreamingResponse(
+        iter_preview(proc, first, close),
+        media_type="video/mp4",
+        headers={"X-Preview-Source": "proxy" if proxy else "original"},
+        # Runs even if the stream is never iterated (client gone before the first byte).
+        background=BackgroundTask(close),
+    )
+
+
 @app.get("/api/presets")
 async def get_presets():
     """
@@ -882,6 +1633,54 @@ async def get_presets():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/effects")
+async def get_effects():
+    """
+    Lists the render effects with their metadata (cost class, particles per
+    word, style keys read) without importing the effect modules.
+    """
+    from effects import list_effects
+    return JSONResponse(content=list_effects())
+
+
+# Profiles allowed at once (each may burn 2 x 10 s of 1080p through ffmpeg);
+# more get a 503.
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "1"))
+PROFILE_SLOTS = threading.BoundedSemaphore(max(1, PROFILE_MAX_CONCURRENT))
+PROFILE_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, PROFILE_MAX_CONCURRENT), thread_name_prefix="profile")
+
+
+@app.get("/api/presets/{preset_id}/profile")
+async def profile_preset_cost(preset_id: str, words: int = 300, libass: bool = True):
+    """
+    Renders a preset over a synthetic word stream and reports its render cost:
+    Python generation time, event count, peak/mean simultaneous events, \\blur
+    and \\t per event, and libass ms per 1080p frame (null without ffmpeg).
+    Runs on a pool of its own, so profiling never queues behind exports or
+    media lookups; more than PROFILE_MAX_CONCURRENT at a time get a 503.
+    """
+    from effects import ALIASES, EFFECTS
+    from profiler import profile_preset
+
+    effect_id = preset_id.replace("-", "_")
+    if preset_id not in PRESET_STYLE_MAP and ALIASES.get(effect_id, effect_id) not in EFFECTS:
+        raise HTTPException(status_code=404, detail="Preset not found")
+    if not 1 <= words <= 5000:
+        raise HTTPException(status_code=400, detail="words must be between 1 and 5000")
+    style = {**PRESET_STYLE_MAP.get(preset_id, {}), "id": preset_id}
+    if not PROFILE_SLOTS.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many profiles in progress, retry shortly",
+            headers={"Retry-After": "10"},
+        )
+    future = PROFILE_EXECUTOR.submit(profile_preset, style, words, 2.5, libass)
+    # Released when the profile finishes, even if the client gives up first.
+    future.add_done_callback(lambda f: PROFILE_SLOTS.release())
+    result = await asyncio.wrap_future(future)
+    return JSONResponse(result)
+
+
 @app.post("/api/presets/update")
 async def update_preset(preset_data: dict):
     """
@@ -0,0 +1,72 @@
+import hashlib
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+# -----------------------------------------------------------------------------
+# Content-addressed upload storage
+# -----------------------------------------------------------------------------
+# Uploads are streamed to disk in fixed-size chunks (memory stays bounded no
+# matter how large the file is) while SHA-256 is computed on the fly. The final
+# file is named after its digest, so the same clip uploaded twice is stored once
+# and the digest can be used as a cache key by later stages. Hashing and disk
+# writes run in the threadpool (hashlib releases the GIL), never on the event loop.
+CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+_MEDIA_ID_RE = re.compile(r"[0-9a-f]{64}\Z")
+
+
+def _write_chunk(f, digest, chunk: bytes):
+    digest.update(chunk)
+    f.write(chunk)
+
+
+def _store(part_path: Path, final_path: Path):
+    if final_path.exists():
+        # Same bytes already stored: keep the existing copy (and mark it recently used).
+        part_path.unlink()
+        os.utime(final_path)
+    else:
+        os.replace(part_path, final_path)
+
+
+async def spool_upload(upload: UploadFile, directory: Path) -> Tuple[Path, str]:
+    """
+    Streams an UploadFile into directory/<sha256><suffix>.
+    Returns (path, sha256 hex digest).
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    suffix = Path(upload.filename or "").suffix.lower() or ".mp4"
+    part_path = directory / f".upload_{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    try:
+        with part_path.open("wb") as f:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                await run_in_threadpool(_write_chunk, f, digest, chunk)
+        media_hash = digest.hexdigest()
+        final_path = directory / f"{media_hash}{suffix}"
+        await run_in_threadpool(_store, part_path, final_path)
+        return final_path, media_hash
+    finally:
+        part_path.unlink(missing_ok=True)
+
+
+def find_media(directory: Path, media_id: str) -> Optional[Path]:
+    """
+    Path of a stored upload by its SHA-256 (the media id returned at upload),
+    or None if it was never uploaded or has been evicted.
+    """
+    if not _MEDIA_ID_RE.match(media_id or ""):
+        return None
+    for path in directory.glob(f"{media_id}.*"):
+        if path.is_file():
+            os.utime(path)  # recently used, for the storage quota
+            return path
+    return None
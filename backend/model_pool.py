@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from faster_whisper import WhisperModel
+
+# -----------------------------------------------------------------------------
+# Whisper model pool
+# -----------------------------------------------------------------------------
+# Loads are serialized (so "medium" and "large" never load at the same time),
+# each model gets a semaphore bounding its in-flight inferences, and idle models
+# are evicted least-recently-used when a new load would exceed the memory budget.
+#
+# Env vars:
+#   WHISPER_MODEL_BUDGET_MB  total estimated model memory (default 8192, 0 = unlimited)
+#   WHISPER_MAX_INFLIGHT     concurrent inferences per model (default: num_workers)
+#   WHISPER_CPU_THREADS      CTranslate2 threads per worker (default 0 = library default)
+#   WHISPER_NUM_WORKERS      CTranslate2 workers per model (default on CPU: cores /
+#                            threads per worker, so parallel requests and long-form
+#                            chunks use every core; default on GPU: 1)
+#   WHISPER_IDLE_TTL_S       unload models idle this long (default 0 = never)
+
+# Rough resident size of each model at int8 (CPU) / float16 (GPU).
+MODEL_SIZES_MB = {
+    "tiny": 150,
+    "tiny.en": 150,
+    "base": 300,
+    "base.en": 300,
+    "small": 900,
+    "small.en": 900,
+    "medium": 2500,
+    "medium.en": 2500,
+    "large-v1": 4500,
+    "large-v2": 4500,
+    "large-v3": 4500,
+    "large": 4500,
+    "distil-large-v2": 2500,
+    "distil-large-v3": 2500,
+}
+UNKNOWN_MODEL_MB = 4500
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class _PoolEntry:
+    def __init__(self, model: WhisperModel, size_mb: int, max_inflight: int):
+        self.model = model
+        self.size_mb = size_mb
+        self.semaphore = threading.BoundedSemaphore(max_inflight)
+        self.in_use = 0
+        self.last_used = time.monotonic()
+
+
+class ModelPool:
+    def __init__(self, device: str, compute_type: str):
+        self.device = device
+        self.compute_type = compute_type
+        self.budget_mb = _env_int("WHISPER_MODEL_BUDGET_MB", 8192)
+        self.cpu_threads = _env_int("WHISPER_CPU_THREADS", 0)
+        # CTranslate2 runs 4 threads per worker when cpu_threads is 0.
+        default_workers = max(1, (os.cpu_count() or 1) // (self.cpu_threads or 4)) if device == "cpu" else 1
+        self.num_workers = max(1, _env_int("WHISPER_NUM_WORKERS", default_workers))
+        self.max_inflight = max(1, _env_int("WHISPER_MAX_INFLIGHT", self.num_workers))
+        self.idle_ttl_s = _env_int("WHISPER_IDLE_TTL_S", 0)
+        self._entries: Dict[str, _PoolEntry] = {}
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._load_lock = threading.Lock()
+
+    def _loaded_mb(self) -> int:
+        return sum(entry.size_mb for entry in self._entries.values())
+
+    def _evict_idle(self, needed_mb: int = 0):
+        """Drops idle models (oldest first) past their TTL or to make room. Caller holds _lock."""
+        now = time.monotonic()
+        for name, entry in sorted(self._entries.items(), key=lambda item: item[1].last_used):
+            if entry.in_use:
+                continue
+            over_budget = self.budget_mb and self._loaded_mb() + needed_mb > self.budget_mb
+            expired = self.idle_ttl_s and now - entry.last_used > self.idle_ttl_s
+            if over_budget or expired:
+                print(f"[models] Unloading idle Whisper model '{name}'")
+                del self._entries[name]
+
+    def _get_entry(self, model_name: str) -> _PoolEntry:
+        with self._lock:
+            self._evict_idle()
+            entry = self._entries.get(model_name)
+            if entry is not None:
+                entry.in_use += 1
+                return entry
+
+        # Only one model loads at a time.
+        with self._load_lock:
+            size_mb = MODEL_SIZES_MB.get(model_name, UNKNOWN_MODEL_MB)
+            with self._lock:
+                entry = self._entries.get(model_name)
+                if entry is None:
+                    self._evict_idle(size_mb)
+                    # Wait for busy models to go idle while we'd exceed the budget,
+                    # unless nothing else is loaded (a single model always fits).
+                    while self.budget_mb and self._entries and self._loaded_mb() + size_mb > self.budget_mb:
+                        self._released.wait()
+                        self._evict_idle(size_mb)
+            if entry is None:
+                print(f"[models] Loading Whisper model '{model_name}' on {self.device}")
+                model = WhisperModel(
+                    model_name,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                    num_workers=self.num_workers,
+                )
+                entry = _PoolEntry(model, size_mb, self.max_inflight)
+            with self._lock:
+                entry = self._entries.setdefault(model_name, entry)
+                entry.in_use += 1
+                return entry
+
+    def _release(self, entry: _PoolEntry):
+        with self._lock:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            self._released.notify_all()
+
+    @contextmanager
+    def acquire(self, model_name: str) -> Iterator[WhisperModel]:
+        """
+        Yields a loaded model with an inference slot reserved. Consume any
+        lazy segment generator inside the block, since that is where decoding runs.
+        """
+        entry = self._get_entry(model_name)
+        try:
+            with entry.semaphore:
+                yield entry.model
+        finally:
+            self._release(entry)
+
+    def preload(self, model_name: str):
+        with self.acquire(model_name):
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            models = {
+                name: {
+                    "size_mb": entry.size_mb,
+                    "in_use": entry.in_use,
+                    "idle_s": round(time.monotonic() - entry.last_used, 1),
+                }
+                for name, entry in self._entries.items()
+            }
+            loaded_mb = self._loaded_mb()
+        return {
+            "device": self.device,
+            "loaded_mb": loaded_mb,
+            "budget_mb": self.budget_mb,
+            "max_inflight": self.max_inflight,
+            "cpu_threads": self.cpu_threads,
+            "num_workers": self.num_workers,
+            "models": models,
+        }
@@ -0,0 +1,202 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+# -----------------------------------------------------------------------------
+# Segment-parallel burn
+# -----------------------------------------------------------------------------
+# libass renders on one thread, so a single ffmpeg burn leaves most cores idle.
+# The input is cut at keyframes into BURN_SEGMENTS time ranges that are burned
+# by concurrent ffmpeg processes with the same .ass file, then joined with the
+# concat demuxer (-c copy) and the original audio is muxed back in. Each range
+# is read with an input -ss/-t; its frames start at 0, so they are shifted by
+# the range start before the ass filter (subtitles see the original timeline)
+# and back to 0 after it.
+#
+# Cuts are frame-exact: a range starts halfway between a keyframe and the frame
+# before it, never on a frame timestamp. With transcoding, -ss drops the frames
+# before the cut and -t the frames from the next cut on. No frame lies on
+# either boundary, so rounding the cut to microseconds and ffmpeg's < / <=
+# handling cannot move a frame: each frame goes to exactly one range, and the
+# joined video has the frames of a single-pass burn.
+BURN_SEGMENTS = int(os.getenv("BURN_SEGMENTS", str(max(1, (os.cpu_count() or 2) // 2))))
+# Ranges shorter than this are not worth a process of their own.
+BURN_MIN_SEGMENT_S = float(os.getenv("BURN_MIN_SEGMENT_S", "15"))
+
+
+def probe_cut_points(video_path: Path) -> List[float]:
+    """
+    Frame-exact cut points of the first video stream, in seconds from the
+    container start: halfway between each keyframe and the frame before it.
+    """
+    def probe(args: List[str]) -> str:
+        result = subprocess.run(["ffprobe", "-v", "error", *args, str(video_path)], capture_output=True, text=True)
+        return result.stdout
+
+    try:
+        start = float(probe(["-show_entries", "format=start_time", "-of", "default=noprint_wrappers=1:nokey=1"]).strip() or 0)
+    except ValueError:
+        start = 0.0
+    frames = []
+    # Packet flags only: no decoding, so this is quick even for long inputs.
+    out = probe(["-select_streams", "v:0", "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0"])
+    for line in out.splitlines():
+        pts, _, flags = line.partition(",")
+        try:
+            frames.append((float(pts) - start, "K" in flags))
+        except ValueError:
+            continue
+    # Packets come in decode order; B-frames make that differ from display order.
+    frames.sort()
+    return [(prev + t) / 2 for (prev, _), (t, key) in zip(frames, frames[1:]) if key]
+
+
+def plan_segments(
+    duration: float,
+    cut_points: List[float],
+    segments: int = BURN_SEGMENTS,
+    min_segment_s: float = BURN_MIN_SEGMENT_S,
+) -> List[Tuple[float, float]]:
+    """
+    Splits [0, duration) into up to `segments` ranges of similar length, each
+    starting at one of cut_points (see probe_cut_points; the first at 0).
+    """
+    count = max(1, min(segments, int(duration // min_segment_s)))
+    cuts = [0.0]
+    for k in range(1, count):
+        target = duration * k / count
+        # First cut point at or after the target, so every range starts on a keyframe.
+        later = [t for t in cut_points if t >= target]
+        if later and later[0] - cuts[-1] >= min_segment_s and duration - later[0] >= min_segment_s:
+            cuts.append(later[0])
+    cuts.append(duration)
+    return list(zip(cuts, cuts[1:]))
+
+
+def _run(cmd: List[str], register: Callable, unregister: Callable, on_time: Callable[[float], None]):
+    """Runs one ffmpeg with -progress on stdout, reporting output seconds; raises on failure."""
+    with tempfile.TemporaryFile(mode="w+") as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+        register(proc)
+        try:
+            for line in proc.stdout:
+                key, _, value = line.strip().partition("=")
+                # out_time_ms is (despite the name) microseconds, same as out_time_us.
+                if key in ("out_time_us", "out_time_ms") and value.isdigit():
+                    on_time(int(value) / 1_000_000)
+            proc.wait()
+        finally:
+            unregister(proc)
+        if proc.returncode != 0:
+            stderr_file.seek(0)
+            raise RuntimeError(f"FFmpeg failed: {stderr_file.read()}")
+
+
+def burn_segments(
+    video_path: Path,
+    output_path: Path,
+    segments: List[Tuple[float, float]],
+    video_filter: Callable[[float], str],
+    encode_args: List[str],
+    job=None,
+    total_s: Optional[float] = None,
+):
+    """
+    Burns each (start, end) range in parallel and joins them into output_path.
+    video_filter(start) returns the -vf chain for a range starting at `start`
+    seconds; encode_args are the video encoder options shared by every range
+    (they must match for -c copy concatenation).
+    """
+    parts_dir = output_path.parent / f"{output_path.stem}_parts"
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    threads = str(max(1, (os.cpu_count() or 2) // len(segments)))
+    done = [0.0] * len(segments)
+    lock = threading.Lock()
+    # Tracked here as well as on the job, so a failed range stops the others
+    # even when there is no job.
+    procs = set()
+    failed = threading.Event()
+
+    def register(proc: subprocess.Popen):
+        with lock:
+            procs.add(proc)
+            # A range that starts after another one failed stops right away.
+            if failed.is_set():
+                proc.kill()
+        if job:
+            job.register_process(proc)
+
+    def unregister(proc: subprocess.Popen):
+        with lock:
+            procs.discard(proc)
+        if job:
+            job.unregister_process(proc)
+
+    def kill_all():
+        with lock:
+            failed.set()
+            running = list(procs)
+        for proc in running:
+            if proc.poll() is None:
+                proc.kill()
+
+    def report(index: int, seconds: float):
+        if not (job and total_s):
+            return
+        with lock:
+            done[index] = seconds
+            job.set_progress(sum(done) / total_s * 100)
+
+    def burn(index: int) -> Path:
+        start, end = segments[index]
+        part = parts_dir / f"part_{index:03d}.mp4"
+        cmd = [
+            "ffmpeg", "-y",
+            "-ss", f"{start:.6f}", "-t", f"{end - start:.6f}", "-i", str(video_path),
+            "-vf", video_filter(start),
+            "-an", *encode_args, "-threads", threads,
+            "-progress", "pipe:1", "-nostats",
+            str(part),
+        ]
+        _run(cmd, register, unregister, lambda seconds: report(index, seconds))
+        if job:
+            job.check_cancelled()
+        return part
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix="burn-segment") as pool:
+            futures = [pool.submit(burn, i) for i in range(len(segments))]
+            try:
+                # Returns as soon as any range fails, not when the earlier ones finish.
+                wait(futures, return_when=FIRST_EXCEPTION)
+                parts = [future.result() for future in futures]
+            except BaseException:
+                # One range failed or was cancelled: stop the others too.
+                for future in futures:
+                    future.cancel()
+                kill_all()
+                raise
+        concat_list = parts_dir / "parts.txt"
+        concat_list.write_text(
+            "".join("file '{}'\n".format(part.as_posix().replace("'", "'\\''")) for part in parts),
+            encoding="utf-8",
+        )
+        cmd = [
+            "ffmpeg", "-y",
+            "-f", "concat", "-safe", "0", "-i", str(concat_list),
+            "-i", str(video_path),
+            "-map", "0:v:0", "-map", "1:a:0?",
+            "-c", "copy",
+            "-progress", "pipe:1", "-nostats",
+            str(output_path),
+        ]
+        _run(cmd, register, unregister, lambda seconds: None)
+        if job:
+            job.check_cancelled()
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
@@ -0,0 +1,131 @@
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# Vectorized particle generation
+# -----------------------------------------------------------------------------
+# Particle presets draw every random value for every word in one NumPy pass,
+# shaped (words, particles), then format the Dialogue lines in bulk. Random
+# values come from a counter-based hash (splitmix64 of seed, stream, word,
+# particle, draw). Words are identified by a hash of their text and timing, not
+# their index, so a word's particles never depend on the other words in the batch
+# or on words inserted or deleted before it: re-rendering one word gives the same
+# result as the full pass.
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_WORD_STRIDE = np.uint64(0xD1B54A32D192ED03)
+_PARTICLE_STRIDE = np.uint64(0xABC98388FB8FAC03)
+_DRAW_STRIDE = np.uint64(0x8CB92BA72F3D8DD7)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    z = x + _GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class ParticleBatch:
+    """Random draws for `count` particles of each word, as (words, count) arrays."""
+
+    def __init__(self, base: np.ndarray, word_ids: np.ndarray, count: int):
+        self.count = count
+        particle_ids = np.arange(count, dtype=np.uint64)
+        self._counters = (
+            base
+            + word_ids.astype(np.uint64)[:, None] * _WORD_STRIDE
+            + particle_ids[None, :] * _PARTICLE_STRIDE
+        )
+        self._draws = 0
+
+    def _unit(self) -> np.ndarray:
+        """Uniform floats in [0, 1); each call is an independent draw."""
+        self._draws += 1
+        draw = np.array([self._draws], dtype=np.uint64) * _DRAW_STRIDE
+        bits = _splitmix64(self._counters + draw)
+        return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+    def uniform(self, low, high) -> np.ndarray:
+        """Like random.uniform; low/high may be per-word (words, 1) arrays."""
+        return low + (np.asarray(high) - low) * self._unit()
+
+    def randint(self, low, high) -> np.ndarray:
+        """Like random.randint (both ends inclusive); bounds may be per-word arrays."""
+        span = np.asarray(high, dtype=np.int64) - low + 1
+        return low + np.floor(self._unit() * span).astype(np.int64)
+
+    def choice(self, options: Sequence) -> np.ndarray:
+        idx = np.minimum((self._unit() * len(options)).astype(np.int64), len(options) - 1)
+        return np.asarray(options)[idx]
+
+
+class ParticleSystem:
+    """Hands out independent ParticleBatches for one render."""
+
+    def __init__(self, seed: int, word_ids: Sequence[int]):
+        self.seed = np.array([seed & 0xFFFFFFFFFFFFFFFF], dtype=np.uint64)
+        # One id per word (render_engine.word_id), so a batch of words draws what the full pass would.
+        self.word_ids = np.array(word_ids, dtype=np.uint64)
+        self._streams = 0
+
+    def batch(self, count: int) -> ParticleBatch:
+        self._streams += 1
+        stream = np.array([self._streams], dtype=np.uint64) * _GOLDEN
+        base = _splitmix64(self.seed ^ stream)
+        return ParticleBatch(base, self.word_ids, count)
+
+
+def word_columns(words: List[Dict]) -> Dict[str, np.ndarray]:
+    """start/end/dur in ms and text of every word, as (words, 1) columns."""
+    start = np.array([int(w['start'] * 1000) for w in words], dtype=np.int64)[:, None]
+    end = np.array([int(w['end'] * 1000) for w in words], dtype=np.int64)[:, None]
+    text = np.empty((len(words), 1), dtype=object)
+    text[:, 0] = [w['text'] for w in words]
+    return {"start": start, "end": end, "dur": end - start, "text": text}
+
+
+@lru_cache(maxsize=None)
+def _percent_template(template: str) -> Tuple[str, Tuple[str, ...]]:
+    """Turns "{name}" fields into %s (faster than str.format) and lists the field names in order."""
+    out = []
+    fields = []
+    for literal, field, _, _ in Formatter().parse(template):
+        out.append(literal.replace("%", "%%"))
+        if field is not None:
+            out.append("%s")
+            fields.append(field)
+    return "".join(out), tuple(fields)
+
+
+def format_events(template: str, n_words: int, **columns) -> List[List[str]]:
+    """
+    Formats template once per (word, particle) cell and returns the lines
+    grouped per word. Fields are plain {name}s; columns are scalars or arrays
+    broadcastable to (words, particles), and float columns are truncated like int().
+    """
+    fmt, fields = _percent_template(template)
+    arrays = {}
+    for name, value in columns.items():
+        arr = np.asarray(value)
+        if arr.dtype.kind == "f":
+            arr = np.trunc(arr).astype(np.int64)
+        arrays[name] = arr
+    shape = np.broadcast_shapes((n_words, 1), *(arr.shape for arr in arrays.values()))
+    flat = {name: np.broadcast_to(arr, shape).ravel().tolist() for name, arr in arrays.items()}
+    lines = [fmt % values for values in zip(*(flat[field] for field in fields))]
+    per_word = shape[1]
+    return [lines[i:i + per_word] for i in range(0, len(lines), per_word)]
+
+
+def merge_layers(layers: List[List[List[str]]]) -> List[List[str]]:
+    """Concatenates per-word line lists of several layers, in layer order."""
+    merged = []
+    for parts in zip(*layers):
+        lines = []
+        for part in parts:
+            lines.extend(part)
+        merged.append(lines)
+    return merged
@@ -0,0 +1,132 @@
+import os
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from ass_format import ass_to_cs, write_script
+from font_metrics import FONTS_DIR
+
+# -----------------------------------------------------------------------------
+# Low-resolution preview burns
+# -----------------------------------------------------------------------------
+# A preview burns only a short window (a few seconds around the playhead) and
+# scales the picture down *before* the ass filter, so libass rasterises at
+# preview size too. Only the events that overlap the window are written to the
+# .ass file, and only the blocks of words near the window are rendered at all
+# (AdvancedRenderer.render_words), so the cost does not grow with the
+# transcript. The input is read from a proxy of the source when one is cached
+# (see proxy.py), and x264 runs with -preset ultrafast. Output is fragmented MP4
+# on stdout, streamed to the client as ffmpeg produces it.
+PREVIEW_HEIGHT = int(os.getenv("PREVIEW_VIDEO_HEIGHT", "360"))
+PREVIEW_MAX_WINDOW_S = float(os.getenv("PREVIEW_VIDEO_MAX_WINDOW_S", "30"))
+# Words that ended this long before the window are still rendered: their
+# events (particles, fades, group layouts) can linger into it.
+PREVIEW_LOOKBACK_S = float(os.getenv("PREVIEW_VIDEO_LOOKBACK_S", "3"))
+# Preview burns allowed at once; more get a 503 (scrubbing would pile them up).
+PREVIEW_VIDEO_MAX_CONCURRENT = int(os.getenv("PREVIEW_VIDEO_MAX_CONCURRENT", "2"))
+PREVIEW_SLOTS = threading.BoundedSemaphore(max(1, PREVIEW_VIDEO_MAX_CONCURRENT))
+STREAM_CHUNK = 64 * 1024
+
+
+def window_events(event_groups: Iterable[Iterable[str]], start_s: float, end_s: float) -> List[str]:
+    """Dialogue lines that are on screen at some point in [start_s, end_s)."""
+    start_cs, end_cs = int(start_s * 100), int(end_s * 100) + 1
+    kept = []
+    for lines in event_groups:
+        for line in lines:
+            _, start, end, _ = line.split(",", 3)
+            if ass_to_cs(start) < end_cs and ass_to_cs(end) > start_cs:
+                kept.append(line)
+    return kept
+
+
+def write_window_script(path: Path, header: str, event_groups: Iterable[Iterable[str]], start_s: float, end_s: float):
+    write_script(path, header, [window_events(event_groups, start_s, end_s)])
+
+
+def preview_command(source: Path, ass_path: Path, start_s: float, duration_s: float, height: int) -> List[str]:
+    """ffmpeg command that burns ass_path over [start_s, start_s + duration_s) of source to fragmented MP4 on stdout."""
+    ass_path_str = ass_path.as_posix().replace(":", r"\:")
+    fonts_dir_str = FONTS_DIR.as_posix().replace(":", r"\:")
+    vf = (
+        f"scale=-2:{height},"
+        # Back onto the source timeline for libass, then restart at 0.
+        f"setpts=PTS+{start_s:.6f}/TB,"
+        f"ass=filename='{ass_path_str}':fontsdir='{fonts_dir_str}',"
+        "setpts=PTS-STARTPTS"
+    )
+    return [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-ss", f"{start_s:.6f}", "-t", f"{duration_s:.6f}", "-i", str(source),
+        "-map", "0:v:0", "-map", "0:a:0?",
+        "-vf", vf,
+        "-c:v", "libx264", "-preset", "ultrafast", "-tune", "zerolatency", "-crf", "30",
+        # A keyframe (and so a fragment) every second: playback starts on the first one.
+        "-force_key_frames", "expr:gte(t,n_forced*1)",
+        "-c:a", "aac", "-b:a", "96k", "-ac", "2",
+        "-movflags", "frag_keyframe+empty_moov+default_base_moof",
+        "-f", "mp4", "pipe:1",
+    ]
+
+
+def start_preview(cmd: List[str]):
+    """
+    Starts ffmpeg and waits for its first output chunk, so a failure can still
+    be reported as an HTTP error. Returns (process, first chunk).
+    """
+    stderr_file = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+    first = proc.stdout.read1(STREAM_CHUNK)
+    if not first:
+        proc.wait()
+        stderr_file.seek(0)
+        detail = stderr_file.read().decode("utf-8", "replace")
+        stderr_file.close()
+        proc.stdout.close()
+        raise RuntimeError(f"FFmpeg failed: {detail}")
+    stderr_file.close()
+    return proc, first
+
+
+def preview_closer(proc: subprocess.Popen, cleanup: Optional[Callable[[], None]] = None) -> Callable[[], None]:
+    """
+    Returns a close() that kills and reaps ffmpeg, closes its stdout pipe and
+    then runs cleanup(), once no matter how often it is called. Call it both
+    when the stream ends and as the response's background task: if the client
+    goes away before the stream is ever iterated, only the background task runs.
+    """
+    done = threading.Event()
+    lock = threading.Lock()
+
+    def close():
+        with lock:
+            if done.is_set():
+                return
+            done.set()
+        if proc.poll() is None:
+            proc.kill()
+        # Killed first, so a read blocked in iter_preview returns before the close.
+        if proc.stdout is not None:
+            proc.stdout.close()
+        proc.wait()
+        if cleanup:
+            cleanup()
+
+    return close
+
+
+def iter_preview(proc: subprocess.Popen, first: bytes, close: Callable[[], None]) -> Iterator[bytes]:
+    """
+    Yields the rest of ffmpeg's stdout, then close() (see preview_closer); also
+    when the client goes away and the generator is closed early.
+    """
+    try:
+        chunk = first
+        while chunk:
+            yield chunk
+            chunk = proc.stdout.read1(STREAM_CHUNK)
+        proc.wait()
+    finally:
+        close()
@@ -0,0 +1,169 @@
+import argparse
+import json
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ass_format import ass_to_cs
+from effects import EFFECTS, resolve_effect_id
+from font_metrics import FONTS_DIR
+from render_engine import AdvancedRenderer
+
+# -----------------------------------------------------------------------------
+# Render-cost profiler for effects / presets
+# -----------------------------------------------------------------------------
+# Renders a preset over a synthetic word stream and reports what makes a
+# script expensive to burn: Python generation time, event count, how many
+# events are on screen at once, and \blur / \t density. If ffmpeg is on PATH
+# it also burns the first LIBASS_SECONDS onto a black 1080p lavfi source and
+# reports libass time per frame (the run minus the same run without the ass
+# filter). Run `python profiler.py` from backend/ for a table of every effect.
+LIBASS_SECONDS = 10
+LIBASS_FPS = 30
+_VOCABULARY = (
+    "the quick brown fox jumps over a lazy dog while everyone watches "
+    "subtitles render frame by frame across seventeen colourful screens"
+).split()
+
+
+def synthetic_words(n_words: int = 300, words_per_second: float = 2.5) -> List[Dict]:
+    """A deterministic word stream with speech-like timing: short gaps, a pause every 8 words."""
+    words = []
+    t = 0.5
+    step = 1.0 / words_per_second
+    for i in range(n_words):
+        text = _VOCABULARY[i % len(_VOCABULARY)]
+        duration = round(step * (0.6 + 0.1 * (len(text) % 4)), 3)
+        words.append({"text": text, "start": round(t, 3), "end": round(t + duration, 3)})
+        t += step + (0.4 if i % 8 == 7 else 0.0)
+    return words
+
+
+def _event_stats(lines: List[str]) -> Dict:
+    points = []
+    blurs = transforms = 0
+    for line in lines:
+        _, start, end, _ = line.split(",", 3)
+        points.append((ass_to_cs(start), 1))
+        points.append((ass_to_cs(end), -1))
+        blurs += line.count("\\blur")
+        transforms += line.count("\\t(")
+    # Ends sort before starts at the same time: back-to-back events do not overlap.
+    points.sort()
+    peak = on_screen = 0
+    area = 0
+    last = points[0][0] if points else 0
+    for t, delta in points:
+        area += on_screen * (t - last)
+        last = t
+        on_screen += delta
+        peak = max(peak, on_screen)
+    span = (points[-1][0] - points[0][0]) if points else 0
+    count = len(lines)
+    return {
+        "events": count,
+        "peak_events": peak,
+        "mean_events": round(area / span, 1) if span else 0.0,
+        "blur_per_event": round(blurs / count, 2) if count else 0.0,
+        "transforms_per_event": round(transforms / count, 2) if count else 0.0,
+    }
+
+
+def libass_ms_per_frame(script: str, seconds: float = LIBASS_SECONDS, fps: int = LIBASS_FPS) -> Optional[float]:
+    """libass time per 1080p frame for the first `seconds` of script, or None without ffmpeg (or if it fails)."""
+    if not shutil.which("ffmpeg"):
+        return None
+    source = f"color=c=black:s=1920x1080:r={fps}:d={seconds}"
+    with tempfile.TemporaryDirectory() as tmp:
+        ass_path = Path(tmp) / "profile.ass"
+        ass_path.write_text(script, encoding="utf-8")
+        ass_str = ass_path.as_posix().replace(":", r"\:")
+        fonts_str = FONTS_DIR.as_posix().replace(":", r"\:")
+
+        def run(vf: Optional[str]) -> float:
+            cmd = ["ffmpeg", "-hide_banner", "-nostats", "-f", "lavfi", "-i", source]
+            if vf:
+                cmd += ["-vf", vf]
+            cmd += ["-f", "null", "-"]
+            started = time.perf_counter()
+            subprocess.run(cmd, capture_output=True, check=True)
+            return time.perf_counter() - started
+
+        try:
+            baseline = run(None)
+            with_ass = run(f"ass=filename='{ass_str}':fontsdir='{fonts_str}'")
+        except subprocess.CalledProcessError as e:
+            # e.g. an ffmpeg built without libass, or a font it cannot load.
+            stderr = (e.stderr or b"").decode("utf-8", "replace")
+            print(f"[profiler] libass measurement failed ({stderr.strip()[-300:]})")
+            return None
+        except OSError as e:
+            print(f"[profiler] libass measurement failed ({e})")
+            return None
+    return round(max(0.0, with_ass - baseline) * 1000 / (seconds * fps), 3)
+
+
+def profile_preset(
+    style: Dict,
+    n_words: int = 300,
+    words_per_second: float = 2.5,
+    libass: bool = True,
+) -> Dict:
+    """Profiles one style (its "id" picks the effect) on synthetic_words()."""
+    words = synthetic_words(n_words, words_per_second)
+    # Warm up: effect module import, font metrics and caches are not part of the cost.
+    AdvancedRenderer(words[:8], style).render()
+    renderer = AdvancedRenderer(words, style)
+    started = time.perf_counter()
+    script = renderer.render()
+    python_ms = (time.perf_counter() - started) * 1000
+    lines = [line for _, _, block in renderer.blocks for line in block]
+    effect_id = resolve_effect_id(style.get("id", "default"))
+    result = {
+        "id": style.get("id"),
+        "effect": effect_id,
+        "cost": EFFECTS[effect_id].cost,
+        "words": n_words,
+        "python_ms": round(python_ms, 1),
+        "python_us_per_word": round(python_ms * 1000 / max(1, n_words), 1),
+        "bytes": len(script.encode("utf-8")),
+        **_event_stats(lines),
+        "culled_events": renderer.culled_events,
+        "libass_ms_per_frame": None,
+    }
+    if libass:
+        result["libass_ms_per_frame"] = libass_ms_per_frame(script)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render-cost table for subtitle effects.")
+    parser.add_argument("ids", nargs="*", help="effect / preset ids (default: every effect)")
+    parser.add_argument("--words", type=int, default=300, help="synthetic words per run")
+    parser.add_argument("--wps", type=float, default=2.5, help="words per second")
+    parser.add_argument("--no-libass", action="store_true", help="skip the ffmpeg/libass measurement")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    rows = [
+        profile_preset({"id": effect_id}, args.words, args.wps, libass=not args.no_libass)
+        for effect_id in (args.ids or list(EFFECTS))
+    ]
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    columns = ("py ms", "events", "peak", "mean", "blur/ev", "\\t/ev", "libass ms/frame")
+    print(f"{'effect':20s} {'cost':6s} " + " ".join(f"{c:>{w}s}" for c, w in zip(columns, (8, 8, 6, 7, 8, 6, 16))))
+    for row in rows:
+        libass_ms = "-" if row["libass_ms_per_frame"] is None else f"{row['libass_ms_per_frame']:.3f}"
+        print(
+            f"{row['effect']:20s} {row['cost']:6s} {row['python_ms']:8.1f} {row['events']:8d} {row['peak_events']:6d} "
+            f"{row['mean_events']:7.1f} {row['blur_per_event']:8.2f} {row['transforms_per_event']:6.2f} {libass_ms:>16s}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+# -----------------------------------------------------------------------------
+# Proxy media
+# -----------------------------------------------------------------------------
+# Low-resolution copies of uploads, cached per media hash, that preview paths
+# read instead of the original (exports always burn the original). A proxy is
+# PROXY_HEIGHT-line H.264 with a keyframe every PROXY_GOP frames, so seeking to
+# any playhead decodes at most a few small frames, plus low-bitrate AAC audio.
+# Proxies are built in the background after upload, on PROXY_WORKERS threads of
+# their own so they never hold up transcription or burn jobs. Audio-only
+# uploads (by suffix, or no video stream per ffprobe) get no proxy, and a failed
+# build is tried again by the next request after PROXY_RETRY_S seconds.
+PROXY_ENABLED = os.getenv("PROXY_MEDIA", "1") == "1"
+PROXY_HEIGHT = 540
+PROXY_GOP = int(os.getenv("PROXY_GOP", "12"))
+PROXY_WORKERS = int(os.getenv("PROXY_WORKERS", "1"))
+PROXY_RETRY_S = float(os.getenv("PROXY_RETRY_S", "300"))
+AUDIO_SUFFIXES = {".aac", ".flac", ".m4a", ".mp3", ".oga", ".ogg", ".opus", ".wav", ".wma"}
+
+STATE_PENDING = "pending"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+STATE_MISSING = "missing"
+STATE_NO_VIDEO = "no_video"
+
+
+def proxy_path(proxy_dir: Path, media_hash: str) -> Path:
+    return proxy_dir / f"{media_hash}_{PROXY_HEIGHT}p.mp4"
+
+
+def find_proxy(proxy_dir: Path, media_hash: str) -> Optional[Path]:
+    """The cached proxy of media_hash, or None if there is none (yet)."""
+    path = proxy_path(proxy_dir, media_hash)
+    return path if path.is_file() else None
+
+
+def has_video(source: Path) -> Optional[bool]:
+    """Whether source has a video stream, or None if ffprobe cannot tell (missing, unreadable file)."""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=codec_type",
+             "-of", "csv=p=0", str(source)],
+            capture_output=True, text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return "video" in result.stdout
+
+
+def proxy_command(source: Path, output_path: Path) -> list:
+    return [
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        "-i", str(source),
+        "-map", "0:v:0", "-map", "0:a:0?",
+        # Never upscale; keep the width even for x264.
+        "-vf", f"scale=-2:'min({PROXY_HEIGHT},ih)'",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", "26",
+        "-g", str(PROXY_GOP), "-keyint_min", str(PROXY_GOP), "-sc_threshold", "0",
+        "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-b:a", "64k", "-ac", "2",
+        "-movflags", "+faststart",
+        str(output_path),
+    ]
+
+
+class ProxyBuilder:
+    """Schedules one background proxy build per media hash and tracks its state."""
+
+    def __init__(
+        self,
+        proxy_dir: Path,
+        workers: int = PROXY_WORKERS,
+        enabled: bool = PROXY_ENABLED,
+        storage=None,
+        retry_s: float = PROXY_RETRY_S,
+    ):
+        self.proxy_dir = proxy_dir
+        # ExportCache: pins the source while it is read, enforces the quota after a build
+        self.storage = storage
+        self.enabled = enabled
+        self.retry_s = retry_s
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="proxy")
+        self._lock = threading.Lock()
+        # media hash -> pending / failed / no_video (ready proxies are found on disk)
+        self._states: Dict[str, str] = {}
+        # media hash -> time.monotonic() of its last failed build
+        self._failed_at: Dict[str, float] = {}
+
+    def ensure(self, source: Path, media_hash: str):
+        """
+        Queues a proxy build for media_hash unless it exists, is queued, has no
+        video, or failed less than retry_s seconds ago.
+        """
+        if not self.enabled or find_proxy(self.proxy_dir, media_hash):
+            return
+        with self._lock:
+            state = self._states.get(media_hash)
+            if state in (STATE_PENDING, STATE_NO_VIDEO):
+                return
+            if state == STATE_FAILED and time.monotonic() - self._failed_at[media_hash] < self.retry_s:
+                return
+            if source.suffix.lower() in AUDIO_SUFFIXES:
+                self._states[media_hash] = STATE_NO_VIDEO
+                return
+            self._states[media_hash] = STATE_PENDING
+        if self.storage is not None:
+            self.storage.pin(source)
+        self._executor.submit(self._build, source, media_hash)
+
+    def status(self, media_hash: str) -> str:
+        if find_proxy(self.proxy_dir, media_hash):
+            return STATE_READY
+        with self._lock:
+            return self._states.get(media_hash, STATE_MISSING)
+
+    def _build(self, source: Path, media_hash: str):
+        final_path = proxy_path(self.proxy_dir, media_hash)
+        # Dot-prefixed while written, so the storage quota and lookups ignore it.
+        tmp_path = self.proxy_dir / f".{final_path.stem}_{os.getpid()}.mp4"
+        state = STATE_FAILED
+        try:
+            if has_video(source) is False:
+                # Audio only: there is nothing to preview.
+                state = STATE_NO_VIDEO
+                return
+            with tempfile.TemporaryFile(mode="w+") as stderr_file:
+                result = subprocess.run(proxy_command(source, tmp_path), stdout=subprocess.DEVNULL, stderr=stderr_file)
+                if result.returncode == 0 and tmp_path.exists():
+                    os.replace(tmp_path, final_path)
+                    state = STATE_READY
+                else:
+                    stderr_file.seek(0)
+                    print(f"[proxy] {media_hash[:12]}: no proxy ({stderr_file.read().strip()[-300:]})")
+        except OSError as e:
+            print(f"[proxy] {media_hash[:12]}: {e}")
+        finally:
+            tmp_path.unlink(missing_ok=True)
+            with self._lock:
+                if state == STATE_READY:
+                    self._states.pop(media_hash, None)
+                else:
+                    self._states[media_hash] = state
+                if state == STATE_FAILED:
+                    self._failed_at[media_hash] = time.monotonic()
+                else:
+                    self._failed_at.pop(media_hash, None)
+            if self.storage is not None:
+                self.storage.unpin(source)
+                if state == STATE_READY:
+                    self.storage.enforce_quota()
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+# -----------------------------------------------------------------------------
+# Persistent transcription cache
+# -----------------------------------------------------------------------------
+# Keyed on the media content hash plus every Whisper parameter that changes the
+# output. Entries are evicted least-recently-used once the stored payloads exceed
+# TRANSCRIPTION_CACHE_MB.
+DEFAULT_BUDGET_MB = 256
+
+
+def transcription_key(
+    media_hash: str,
+    model_name: str,
+    language: Optional[str],
+    use_vad: bool,
+    beam_size: int,
+    best_of: int,
+    temperature: float,
+    long_form: bool = False,
+) -> str:
+    params = [media_hash, model_name, language or "", bool(use_vad), int(beam_size), int(best_of), float(temperature)]
+    if long_form:
+        params.append("long_form")
+    return hashlib.sha256(json.dumps(params).encode("utf-8")).hexdigest()
+
+
+class TranscriptionCache:
+    def __init__(self, db_path: Path, budget_bytes: Optional[int] = None):
+        if budget_bytes is None:
+            budget_bytes = int(float(os.getenv("TRANSCRIPTION_CACHE_MB", DEFAULT_BUDGET_MB)) * 1024 * 1024)
+        self.budget_bytes = budget_bytes
+        self.hits = 0
+        self.misses = 0
+        # Sum of the original transcription time of every entry served from cache.
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS transcriptions (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                elapsed REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def contains(self, key: str) -> bool:
+        """Checks for an entry without touching hit/miss counters or LRU order."""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM transcriptions WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, elapsed FROM transcriptions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_seconds += row[1]
+            self._conn.execute("UPDATE transcriptions SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict, elapsed: float):
+        """Stores value; elapsed is how long the real transcription took."""
+        payload = json.dumps(value)
+        size = len(payload.encode("utf-8"))
+        if size > self.budget_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcriptions (key, payload, size, elapsed, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, elapsed, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcriptions").fetchone()[0]
+        if total <= self.budget_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM transcriptions ORDER BY last_used ASC").fetchall()
+        for key, size in rows:
+            if total <= self.budget_bytes:
+                break
+            self._conn.execute("DELETE FROM transcriptions WHERE key = ?", (key,))
+            total -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcriptions"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 1),
+            "entries": entries,
+            "size_bytes": size,
+            "budget_bytes": self.budget_bytes,
+        }
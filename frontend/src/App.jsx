@@ -128,7 +128,18 @@ export default function App() {
     form.append("resolution", resolution);
     setLoading(true);
     try {
-      const res = await axios.post(`${API_BASE}/export`, form, {
+      // Export runs as a background job: queue it, poll until done, then download.
+      const { data: job } = await axios.post(`${API_BASE}/export`, form);
+      let state = job.state;
+      while (state === "queued" || state === "running") {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        const { data: status } = await axios.get(`${API_BASE}/jobs/${job.job_id}`);
+        state = status.state;
+        if (state === "failed") throw new Error(status.error || "Export job failed");
+      }
+      if (state !== "done") throw new Error(`Export job ${state}`);
+
+      const res = await axios.get(`${API_BASE}/jobs/${job.job_id}/result`, {
         responseType: "blob",
       });
 